@@ -60,10 +60,12 @@ def load_tokens() -> Dict[str, Any]:
 
 
 def save_tokens(data: Dict[str, Any]) -> None:
-    """Persist token data back to tokens.json."""
+    """Persist token data back to tokens.json (atomically, via a temp file + rename)."""
+    tmp_file = TOKEN_FILE.with_name(TOKEN_FILE.name + ".tmp")
     try:
-        with TOKEN_FILE.open("w", encoding="utf-8") as fh:
+        with tmp_file.open("w", encoding="utf-8") as fh:
             json.dump(data, fh, indent=2)
+        os.replace(tmp_file, TOKEN_FILE)
         logger.info("Tokens saved to %s", TOKEN_FILE)
     except Exception as exc:  # pragma: no cover
         logger.error("Failed to write %s: %s", TOKEN_FILE, exc)
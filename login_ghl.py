@@ -7,6 +7,7 @@ import os
 import time
 import json
 import logging
+import orjson
 import pyotp
 import re
 from selenium import webdriver
@@ -16,6 +17,7 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
 # Import area code module
 from area_code import get_best_area_code, get_area_codes_batch_openai
 
@@ -33,6 +35,133 @@ password = os.getenv("CRM_PASSWORD", "CCDocs@2003")
 totp_secret = os.getenv("CRM_TOTP_SECRET", "TETXRXJ4EMYCFTCWJSHFOPOPZ3V3MXX2")
 crm_url = "https://crm.ccdocs.com/"
 
+# Locators reused across the phone number table lookups
+TABLE_ROW_LOCATOR = (By.CSS_SELECTOR, "tr")
+RADIO_BUTTON_LOCATOR = (By.CSS_SELECTOR, "input[type='radio']")
+PHONE_CELL_LOCATOR = (By.CSS_SELECTOR, "tbody tr td[data-col-key='phoneNumber']")
+
+# Cached CRM session files older than this are ignored
+CACHE_MAX_AGE_SECONDS = 10 * 60
+
+# Precompiled pattern used by parse_zip_codes
+ZIP_CODE_RE = re.compile(r'\b\d{5}\b')
+
+# Everything but digits and '.' in a price like "$1.15" or "€1.15" (any Unicode character is stripped)
+NON_PRICE_CHARS_RE = re.compile(r'[^0-9.]')
+
+# Extracts all phone number rows from the results table in one executeScript call.
+# This is already a single round-trip; executeScript is used rather than CDP
+# Runtime.evaluate(returnByValue) so each row's radio input comes back as a WebElement.
+CAPTURE_PHONE_ROWS_JS = """
+var rows = Array.from(document.querySelectorAll('tbody tr'));
+var cellsByRow = new Map(rows.map(function (row) { return [row, {}]; }));
+// Query every keyed cell once and bucket it by its parent row
+document.querySelectorAll('tbody tr td[data-col-key]').forEach(function (cell) {
+    var cells = cellsByRow.get(cell.parentElement);
+    if (cells) {
+        cells[cell.getAttribute('data-col-key')] = cell;
+    }
+});
+return rows.map(function (row, i) {
+    var cells = cellsByRow.get(row);
+    function cellText(key) {
+        return cells[key] ? cells[key].innerText.trim() : null;
+    }
+    var phoneCell = cells['phoneNumber'];
+    var phoneNumber = phoneCell ? phoneCell.innerText.trim().split('\\n')[0] : null;
+    var location = '';
+    if (phoneCell) {
+        var spans = phoneCell.querySelectorAll('span');
+        for (var j = 0; j < spans.length; j++) {
+            var text = spans[j].innerText.trim();
+            if (text && text !== phoneNumber && text.charAt(0) !== '+') {
+                location = text;
+                break;
+            }
+        }
+    }
+    var radio = row.querySelector("input[type='radio']");
+    var selectable = !!radio;
+    return {
+        phone_number: phoneNumber,
+        location: location || 'Unknown',
+        capabilities: cellText('capabilities') || 'Unknown',
+        address_requirement: cellText('addressRequirement') || 'Unknown',
+        price: cellText('price') || 'Unknown',
+        type: cellText('type') || 'Unknown',
+        selectable: selectable,
+        radio_index: selectable ? i : null,
+        row_index: i,
+        radio: radio
+    };
+});
+"""
+
+# Returns the first radio button of every table row (or null), indexed like CAPTURE_PHONE_ROWS_JS
+ROW_RADIO_BUTTONS_JS = """
+return Array.from(document.querySelectorAll('tbody tr')).map(function (row) {
+    return row.querySelector("input[type='radio']");
+});
+"""
+
+# Returns the trimmed rendered text of every cell in the row passed as arguments[0]
+ROW_CELL_TEXTS_JS = """
+return Array.from(arguments[0].querySelectorAll('td')).map(function (cell) {
+    return cell.innerText.trim();
+});
+"""
+
+# Returns the rendered text of each row passed in arguments[0], or null for hidden rows.
+# A row counts as visible when it has a layout box (so display:none rows and their
+# descendants don't, while position:fixed rows do) and isn't visibility:hidden.
+VISIBLE_ROW_TEXTS_JS = """
+return arguments[0].map(function (row) {
+    var visible = row.getClientRects().length > 0 && window.getComputedStyle(row).visibility !== 'hidden';
+    return visible ? row.innerText : null;
+});
+"""
+
+def is_fresh_file(path, max_age=CACHE_MAX_AGE_SECONDS):
+    """Return True if the file exists and was modified within max_age seconds."""
+    try:
+        return time.time() - os.path.getmtime(path) < max_age
+    except OSError:
+        return False
+
+def load_recent_purchase(area_code=None):
+    """
+    Load the last purchase result if selected_phone_number.json is fresh and valid.
+    
+    Args:
+        area_code (str): Area code the cached number must match, if provided
+        
+    Returns:
+        dict: Result in the same shape as Phone_Number_Purchase or None
+    """
+    if not is_fresh_file("selected_phone_number.json") or not os.path.exists("crm_headers.json"):
+        return None
+    
+    try:
+        with open("selected_phone_number.json", "rb") as f:
+            phone_info = orjson.loads(f.read())
+        with open("crm_headers.json", "rb") as f:
+            headers = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Could not read cached purchase data: {e}")
+        return None
+    
+    if phone_info.get('error') or phone_info.get('phone_number') in (None, "Unknown", "Existing", "Wrong Area"):
+        return None
+    if area_code and phone_info.get('area_code') != area_code:
+        return None
+    
+    return {"headers": headers, "selected_phone_number": phone_info}
+
+def find_row_radio_buttons(driver):
+    """Return each table row's radio WebElement keyed by row index, in one script call."""
+    radio_buttons = driver.execute_script(ROW_RADIO_BUTTONS_JS) or []
+    return {i: radio for i, radio in enumerate(radio_buttons) if radio is not None}
+
 def uncheck_custom_checkboxes(driver):
     """Uncheck MMS and Toll Free checkboxes."""
     try:
@@ -56,13 +185,15 @@ def uncheck_custom_checkboxes(driver):
     except Exception as e:
         logger.error(f"Could not process custom checkboxes: {e}")
 
-def Phone_Number_Purchase(zip_codes=None, area_code=None):
+def Phone_Number_Purchase(zip_codes=None, area_code=None, reuse_recent=False):
     """
     Authenticate with CRM and purchase a phone number.
     
     Args:
         zip_codes (str or list): ZIP codes to use for area code lookup
         area_code (str): Specific area code to use (overrides zip_codes if provided)
+        reuse_recent (bool): Return a fresh selected_phone_number.json for the same area code
+            instead of launching the browser (e.g. when retrying a run that already purchased)
         
     Returns:
         dict: Headers with cookies or None if failed
@@ -104,6 +235,12 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
     else:
         logger.info("No area code specified, will search for any available numbers")
 
+    if reuse_recent:
+        recent_purchase = load_recent_purchase(area_code)
+        if recent_purchase:
+            logger.info(f"🎯 Reusing recent phone number purchase: {recent_purchase['selected_phone_number']['phone_number']}")
+            return recent_purchase
+
     logger.info(f"Authenticating to CRM as {email}")
     opts = Options()
     opts.headless = False  # Set to False to see the browser
@@ -113,6 +250,8 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_experimental_option("detach", True)
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    # The user agent never changes for the life of the browser, so read it once up front
+    driver._cached_ua = driver.execute_script("return navigator.userAgent;")
     
     try:
         logger.info(f"Opening CRM at {crm_url}")
@@ -248,7 +387,7 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                     break
                             if settings_elem:
                                 break
-                        except:
+                        except WebDriverException:
                             continue
                     
                     if settings_elem:
@@ -303,7 +442,7 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                     break
                             if phone_elem:
                                 break
-                        except:
+                        except WebDriverException:
                             continue
                     
                     if phone_elem:
@@ -474,41 +613,53 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                                     
                                                     if visible_table:
                                                         # Get rows directly from the visible table
-                                                        fresh_rows = visible_table.find_elements(By.CSS_SELECTOR, "tr")
+                                                        fresh_rows = visible_table.find_elements(*TABLE_ROW_LOCATOR)
                                                         logger.info(f"Found {len(fresh_rows)} rows in the visible table")
                                                     else:
                                                         # Fallback to all tr elements if no visible table found
-                                                        fresh_rows = driver.find_elements(By.CSS_SELECTOR, "tr")
+                                                        fresh_rows = driver.find_elements(*TABLE_ROW_LOCATOR)
                                                         logger.info(f"No visible table found, using all {len(fresh_rows)} tr elements")
                                                 else:
                                                     # Fallback to all tr elements
-                                                    fresh_rows = driver.find_elements(By.CSS_SELECTOR, "tr")
+                                                    fresh_rows = driver.find_elements(*TABLE_ROW_LOCATOR)
                                                     logger.info(f"No tables found, using all {len(fresh_rows)} tr elements")
                                             except Exception as e:
                                                 logger.warning(f"Error finding tables: {e}, falling back to direct tr search")
                                                 # Last resort: get all tr elements
-                                                fresh_rows = driver.find_elements(By.CSS_SELECTOR, "tr")
+                                                fresh_rows = driver.find_elements(*TABLE_ROW_LOCATOR)
                                                 logger.info(f"Found {len(fresh_rows)} total rows on page (fallback method)")
                                             
+                                            # Read visibility and text for every row in one script call
+                                            # instead of is_displayed() + .text requests per row
+                                            try:
+                                                row_texts = driver.execute_script(VISIBLE_ROW_TEXTS_JS, fresh_rows) or []
+                                            except WebDriverException as e:
+                                                # One stale row fails the whole script call; read the rows
+                                                # one at a time so only the rows that error are skipped
+                                                logger.warning(f"Could not read row texts in one call, reading rows individually: {e}")
+                                                row_texts = []
+                                                for row in fresh_rows:
+                                                    try:
+                                                        row_texts.append(row.text if row.is_displayed() else None)
+                                                    except WebDriverException:
+                                                        row_texts.append(None)
+                                            
                                             # Filter for rows that are actually displayed and contain phone numbers
                                             phone_rows = []
-                                            for row in fresh_rows:
-                                                try:
-                                                    if row.is_displayed():
-                                                        row_text = row.text
-                                                        # Check if this row contains a phone number and is not a header or existing number
-                                                        if "+1" in row_text and any(char.isdigit() for char in row_text) and "Default Number" not in row_text:
-                                                            # Prioritize rows with the target area code if specified
-                                                            if area_code and f"+1 {area_code}" in row_text:
-                                                                # Insert at beginning to prioritize area code matches
-                                                                phone_rows.insert(0, row)
-                                                                logger.info(f"📞 Found priority phone row with target area code: {row_text[:100]}...")
-                                                            else:
-                                                                phone_rows.append(row)
-                                                                logger.info(f"📞 Found phone row: {row_text[:100]}...")
-                                                except Exception as e:
-                                                    # Skip rows that cause errors
+                                            for row, row_text in zip(fresh_rows, row_texts):
+                                                # Hidden rows come back as null
+                                                if row_text is None:
                                                     continue
+                                                # Check if this row contains a phone number and is not a header or existing number
+                                                if "+1" in row_text and any(char.isdigit() for char in row_text) and "Default Number" not in row_text:
+                                                    # Prioritize rows with the target area code if specified
+                                                    if area_code and f"+1 {area_code}" in row_text:
+                                                        # Insert at beginning to prioritize area code matches
+                                                        phone_rows.insert(0, row)
+                                                        logger.info(f"📞 Found priority phone row with target area code: {row_text[:100]}...")
+                                                    else:
+                                                        phone_rows.append(row)
+                                                        logger.info(f"📞 Found phone row: {row_text[:100]}...")
                                             
                                             return phone_rows
                                         
@@ -553,15 +704,15 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                             
                                             # Try to extract additional details from cells
                                             try:
-                                                cells = first_row.find_elements(By.TAG_NAME, "td")
+                                                # Read every cell's text in one call instead of one .text request per cell
+                                                cell_texts = driver.execute_script(ROW_CELL_TEXTS_JS, first_row) or []
                                                 price = "Unknown"
-                                                for i, cell in enumerate(cells):
-                                                    cell_text = cell.text.strip()
+                                                for i, cell_text in enumerate(cell_texts):
                                                     if '$' in cell_text:
                                                         price = cell_text
                                                         logger.info(f"💰 Found price: {price} in cell {i}")
                                                         break
-                                            except:
+                                            except WebDriverException:
                                                 price = "Unknown"
                                             
                                             # Create selected number info
@@ -588,8 +739,8 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                             logger.info(f"   Area Code: {area_code}")
                                             
                                             # Save selected number details to JSON file
-                                            with open("selected_phone_number.json", "w") as f:
-                                                json.dump(selected_number_info, f, indent=2)
+                                            with open("selected_phone_number.json", "wb") as f:
+                                                f.write(orjson.dumps(selected_number_info, option=orjson.OPT_INDENT_2))
                                             logger.info("💾 Saved selected phone number details to selected_phone_number.json")
                                     
                                     except Exception as e:
@@ -611,7 +762,7 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                                 if first_row:
                                                     logger.info("Attempting to click radio button in the first row...")
                                                     # Try to find the radio button in this row
-                                                    radio_buttons = first_row.find_elements(By.CSS_SELECTOR, "input[type='radio']")
+                                                    radio_buttons = first_row.find_elements(*RADIO_BUTTON_LOCATOR)
                                                     if radio_buttons:
                                                         radio_btn = radio_buttons[0]
                                                         # Scroll to the radio button to make sure it's in view
@@ -640,7 +791,7 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                             if not radio_clicked:
                                                 try:
                                                     logger.info("Trying Method 2: Find row with exact phone number...")
-                                                    all_visible_rows = driver.find_elements(By.CSS_SELECTOR, "tr")
+                                                    all_visible_rows = driver.find_elements(*TABLE_ROW_LOCATOR)
                                                     logger.info(f"Searching through {len(all_visible_rows)} rows for {phone_number}")
                                                     
                                                     for i, row in enumerate(all_visible_rows):
@@ -653,7 +804,7 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                                                     logger.info(f"🎯 Found matching row {i} containing {phone_number}")
                                                                     
                                                                     # Try to find and click radio button in this specific row
-                                                                    radio_buttons = row.find_elements(By.CSS_SELECTOR, "input[type='radio']")
+                                                                    radio_buttons = row.find_elements(*RADIO_BUTTON_LOCATOR)
                                                                     if radio_buttons:
                                                                         radio_btn = radio_buttons[0]
                                                                         # Scroll to element and try direct click
@@ -733,7 +884,7 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                             if not radio_clicked:
                                                 logger.warning("🚨 LAST RESORT: Trying to click any available radio button...")
                                                 try:
-                                                    all_radios = driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
+                                                    all_radios = driver.find_elements(*RADIO_BUTTON_LOCATOR)
                                                     logger.info(f"Found {len(all_radios)} total radio buttons")
                                                     
                                                     for i, radio in enumerate(all_radios):
@@ -749,14 +900,14 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                                                                     radio_clicked = True
                                                                     time.sleep(1)
                                                                     break
-                                                                except:
+                                                                except WebDriverException:
                                                                     # Try JavaScript click
                                                                     driver.execute_script("arguments[0].click();", radio)
                                                                     logger.warning(f"⚠️ JS CLICKED RADIO {i} - MAY NOT BE FOR {phone_number}")
                                                                     radio_clicked = True
                                                                     time.sleep(1)
                                                                     break
-                                                        except:
+                                                        except WebDriverException:
                                                             continue
                                                 except Exception as e:
                                                     logger.error(f"Last resort method failed: {e}")
@@ -889,20 +1040,20 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
             # Save cookies
             cookies = driver.get_cookies()
             cookie_str = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
-            with open("crm_cookies.json", "w") as f:
-                json.dump(cookies, f)
+            with open("crm_cookies.json", "wb") as f:
+                f.write(orjson.dumps(cookies))
             logger.info("Saved cookies to crm_cookies.json")
 
             # Save headers
             headers = {
                 "Cookie": cookie_str,
-                "User-Agent": driver.execute_script("return navigator.userAgent;"),
+                "User-Agent": driver._cached_ua,
                 "Accept": "application/json, text/plain, */*",
                 "X-Requested-With": "XMLHttpRequest",
                 "Referer": crm_url
             }
-            with open("crm_headers.json", "w") as f:
-                json.dump(headers, f)
+            with open("crm_headers.json", "wb") as f:
+                f.write(orjson.dumps(headers))
             logger.info("Saved headers to crm_headers.json")
             
             # Return headers along with selected phone number info if available
@@ -915,6 +1066,8 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
             else:
                 # Try to read JSON only if no current session data
                 try:
+                    if not is_fresh_file("selected_phone_number.json"):
+                        raise FileNotFoundError("selected_phone_number.json is missing or stale")
                     with open("selected_phone_number.json", "r") as f:
                         phone_info = json.load(f)
                         # Only use if it doesn't have error and has current timestamp (within last 10 minutes)
@@ -925,7 +1078,7 @@ def Phone_Number_Purchase(zip_codes=None, area_code=None):
                         else:
                             result["selected_phone_number"] = None
                             logger.warning("⚠️ Phone number purchase attempted but no valid data captured")
-                except:
+                except (OSError, ValueError):
                     result["selected_phone_number"] = None
                     logger.warning("⚠️ No phone number purchase data available")
             
@@ -949,24 +1102,17 @@ def parse_zip_codes(zip_codes_str):
     """
     if not zip_codes_str:
         return []
-        
-    # Handle comma-separated list
-    if ',' in zip_codes_str:
-        return [z.strip() for z in zip_codes_str.split(',') if z.strip()]
-        
-    # Handle space-separated list
-    if ' ' in zip_codes_str:
-        return [z.strip() for z in zip_codes_str.split() if z.strip()]
-        
-    # Extract all 5-digit numbers from the string
-    zip_matches = re.findall(r'\b\d{5}\b', zip_codes_str)
+    
+    # One regex scan covers comma, space and free-form separated lists
+    zip_matches = ZIP_CODE_RE.findall(zip_codes_str)
     if zip_matches:
         return zip_matches
-        
+    
     # If it's just a single ZIP code
-    if zip_codes_str.strip().isdigit() and len(zip_codes_str.strip()) == 5:
-        return [zip_codes_str.strip()]
-        
+    zip_code = zip_codes_str.strip()
+    if zip_code.isdigit() and len(zip_code) == 5:
+        return [zip_code]
+    
     return []
 
 def capture_all_phone_numbers(driver):
@@ -977,103 +1123,52 @@ def capture_all_phone_numbers(driver):
         driver: Selenium WebDriver instance
         
     Returns:
-        list: List of dictionaries containing phone number details
+        tuple: (all_phone_numbers, radio_elements)
+            - all_phone_numbers: List of dictionaries containing phone number details
+            - radio_elements: Dictionary mapping radio_index to the row's radio WebElement
     """
     try:
         logger.info("📋 CAPTURING ALL AVAILABLE PHONE NUMBERS FROM TABLE...")
         
-        # Wait for the table to load
-        time.sleep(3)
+        # Wait for the table to load, returning as soon as the first row is rendered
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located(PHONE_CELL_LOCATOR)
+            )
+        except TimeoutException:
+            logger.warning("Timed out waiting for phone number table rows")
         
-        # Find all table rows with phone number data
-        phone_rows = driver.find_elements(By.CSS_SELECTOR, "tbody tr")
-        logger.info(f"Found {len(phone_rows)} phone number rows in table")
+        # Extract every row in a single browser round-trip instead of one
+        # WebDriver call per cell
+        rows = driver.execute_script(CAPTURE_PHONE_ROWS_JS) or []
+        logger.info(f"Found {len(rows)} phone number rows in table")
         
         all_phone_numbers = []
+        radio_elements = {}
+        # All rows from one capture share the same timestamp
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         
-        for i, row in enumerate(phone_rows):
-            try:
-                phone_data = {}
-                
-                # Extract phone number
-                try:
-                    phone_cell = row.find_element(By.CSS_SELECTOR, "td[data-col-key='phoneNumber']")
-                    phone_number = phone_cell.text.strip().split('\n')[0]  # Get first line if multiple lines
-                    phone_data['phone_number'] = phone_number
-                    
-                    # Try to extract location/city from the same cell
-                    try:
-                        location_elements = phone_cell.find_elements(By.TAG_NAME, "span")
-                        location = ""
-                        for elem in location_elements:
-                            text = elem.text.strip()
-                            if text and text != phone_number and not text.startswith('+'):
-                                location = text
-                                break
-                        phone_data['location'] = location if location else "Unknown"
-                    except:
-                        phone_data['location'] = "Unknown"
-                        
-                except Exception as e:
-                    logger.warning(f"Could not extract phone number from row {i}: {e}")
-                    continue
-                
-                # Extract capabilities
-                try:
-                    capabilities_cell = row.find_element(By.CSS_SELECTOR, "td[data-col-key='capabilities']")
-                    capabilities = capabilities_cell.text.strip()
-                    phone_data['capabilities'] = capabilities
-                except:
-                    phone_data['capabilities'] = "Unknown"
-                
-                # Extract address requirement
-                try:
-                    address_cell = row.find_element(By.CSS_SELECTOR, "td[data-col-key='addressRequirement']")
-                    address_requirement = address_cell.text.strip()
-                    phone_data['address_requirement'] = address_requirement
-                except:
-                    phone_data['address_requirement'] = "Unknown"
-                
-                # Extract price
-                try:
-                    price_cell = row.find_element(By.CSS_SELECTOR, "td[data-col-key='price']")
-                    price = price_cell.text.strip()
-                    phone_data['price'] = price
-                except:
-                    phone_data['price'] = "Unknown"
-                
-                # Extract type if available
-                try:
-                    type_cell = row.find_element(By.CSS_SELECTOR, "td[data-col-key='type']")
-                    number_type = type_cell.text.strip()
-                    phone_data['type'] = number_type
-                except:
-                    phone_data['type'] = "Unknown"
-                
-                # Check if radio button exists for selection
-                try:
-                    radio_button = row.find_element(By.CSS_SELECTOR, "input[type='radio']")
-                    phone_data['selectable'] = True
-                    phone_data['radio_index'] = i
-                except:
-                    phone_data['selectable'] = False
-                    phone_data['radio_index'] = None
-                
-                # Add metadata
-                phone_data['row_index'] = i
-                phone_data['timestamp'] = time.strftime("%Y-%m-%d %H:%M:%S")
-                
-                all_phone_numbers.append(phone_data)
-                
-                logger.info(f"📞 Row {i+1}: {phone_data['phone_number']} | {phone_data['location']} | {phone_data['price']} | {phone_data['capabilities']}")
-                
-            except Exception as e:
-                logger.warning(f"Error processing row {i}: {e}")
+        for phone_data in rows:
+            i = phone_data['row_index']
+            # Keep the radio WebElement out of the JSON-serializable row data
+            radio = phone_data.pop('radio', None)
+            if not phone_data.get('phone_number'):
+                logger.warning(f"Could not extract phone number from row {i}")
                 continue
+            
+            if radio is not None:
+                radio_elements[i] = radio
+            
+            # Add metadata
+            phone_data['timestamp'] = timestamp
+            
+            all_phone_numbers.append(phone_data)
+            
+            logger.info(f"📞 Row {i+1}: {phone_data['phone_number']} | {phone_data['location']} | {phone_data['price']} | {phone_data['capabilities']}")
         
         # Save all phone numbers to JSON file
-        with open("all_available_phone_numbers.json", "w") as f:
-            json.dump(all_phone_numbers, f, indent=2)
+        with open("all_available_phone_numbers.json", "wb") as f:
+            f.write(orjson.dumps(all_phone_numbers, option=orjson.OPT_INDENT_2))
         
         logger.info(f"💾 SAVED {len(all_phone_numbers)} PHONE NUMBERS TO all_available_phone_numbers.json")
         
@@ -1085,13 +1180,13 @@ def capture_all_phone_numbers(driver):
         if len(all_phone_numbers) > 5:
             logger.info(f"   ... and {len(all_phone_numbers) - 5} more numbers")
         
-        return all_phone_numbers
+        return all_phone_numbers, radio_elements
         
     except Exception as e:
         logger.error(f"Error capturing phone numbers: {e}")
-        return []
+        return [], {}
 
-def select_phone_number_by_criteria(driver, all_numbers, criteria=None):
+def select_phone_number_by_criteria(driver, all_numbers, criteria=None, radio_elements=None):
     """
     Select a phone number based on specific criteria.
     
@@ -1099,6 +1194,7 @@ def select_phone_number_by_criteria(driver, all_numbers, criteria=None):
         driver: Selenium WebDriver instance
         all_numbers: List of phone number dictionaries
         criteria: Dictionary with selection criteria (e.g., {'location': 'Dallas', 'price': 'lowest'})
+        radio_elements: Radio WebElements keyed by radio_index, as returned by capture_all_phone_numbers
         
     Returns:
         dict: Selected phone number details or None
@@ -1119,36 +1215,52 @@ def select_phone_number_by_criteria(driver, all_numbers, criteria=None):
         if criteria:
             logger.info(f"Applying selection criteria: {criteria}")
             
-            # Filter by location if specified
-            if 'location' in criteria:
-                location_filter = criteria['location'].lower()
-                filtered = [num for num in selectable_numbers if location_filter in num.get('location', '').lower()]
-                if filtered:
-                    selectable_numbers = filtered
-                    logger.info(f"Filtered to {len(selectable_numbers)} numbers matching location '{criteria['location']}'")
+            location_filter = criteria['location'].lower() if 'location' in criteria else None
+            required_capability = criteria['capabilities'].lower() if 'capabilities' in criteria else None
+            
+            def matches_location(num):
+                return location_filter in num.get('location', '').lower()
+            
+            def matches_capability(num):
+                return required_capability in num.get('capabilities', '').lower()
             
-            # Filter by price if specified
             if 'price' in criteria and criteria['price'] == 'lowest':
+                # Lowest price needs every candidate, so materialize the location filter
+                if location_filter is not None:
+                    filtered = [num for num in selectable_numbers if matches_location(num)]
+                    if filtered:
+                        selectable_numbers = filtered
+                        logger.info(f"Filtered to {len(selectable_numbers)} numbers matching location '{criteria['location']}'")
                 try:
                     # Convert prices to float for comparison (assuming format like "$1.00")
-                    for num in selectable_numbers:
-                        price_str = num.get('price', '0')
-                        price_value = float(re.sub(r'[^\d.]', '', price_str)) if price_str != 'Unknown' else 999.99
-                        num['price_value'] = price_value
-                    
-                    selected_number = min(selectable_numbers, key=lambda x: x.get('price_value', 999.99))
+                    # Parse the price column once and take its argmin rather than annotating every row
+                    price_values = [
+                        float(NON_PRICE_CHARS_RE.sub('', price_str) or 999.99) if price_str != 'Unknown' else 999.99
+                        for price_str in (num.get('price', '0') for num in selectable_numbers)
+                    ]
+                    lowest_index = min(range(len(price_values)), key=price_values.__getitem__)
+                    selected_number = selectable_numbers[lowest_index]
+                    selected_number['price_value'] = price_values[lowest_index]
                     logger.info(f"Selected lowest price number: {selected_number['phone_number']} at {selected_number['price']}")
                 except Exception as e:
                     logger.warning(f"Could not sort by price: {e}")
                     selected_number = selectable_numbers[0]
-            
-            # Filter by capabilities if specified
-            if 'capabilities' in criteria:
-                required_capability = criteria['capabilities'].lower()
-                filtered = [num for num in selectable_numbers if required_capability in num.get('capabilities', '').lower()]
-                if filtered:
-                    selectable_numbers = filtered
-                    logger.info(f"Filtered to {len(selectable_numbers)} numbers with capability '{criteria['capabilities']}'")
+            else:
+                # Stop at the first number that satisfies the criteria. A filter that
+                # matches nothing is ignored, so fall back from both filters to each one.
+                predicates = []
+                if location_filter is not None:
+                    predicates.append(matches_location)
+                if required_capability is not None:
+                    predicates.append(matches_capability)
+                
+                for preds in (predicates, predicates[:1], predicates[1:]):
+                    if not preds:
+                        continue
+                    selected_number = next((num for num in selectable_numbers if all(pred(num) for pred in preds)), None)
+                    if selected_number:
+                        logger.info(f"Selected first number matching criteria: {selected_number['phone_number']}")
+                        break
         
         # If no specific selection made, use first available
         if not selected_number:
@@ -1157,20 +1269,36 @@ def select_phone_number_by_criteria(driver, all_numbers, criteria=None):
         
         # Click the radio button to select this number
         try:
-            radio_buttons = driver.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-            if selected_number['radio_index'] < len(radio_buttons):
-                radio_buttons[selected_number['radio_index']].click()
+            if radio_elements is None:
+                # No cached elements from capture_all_phone_numbers, look them up once
+                radio_elements = find_row_radio_buttons(driver)
+            
+            radio_btn = radio_elements.get(selected_number['radio_index'])
+            if radio_btn is not None:
+                try:
+                    radio_btn.click()
+                except StaleElementReferenceException:
+                    # The table re-rendered since it was captured, re-query the radios once
+                    logger.warning("Cached radio button went stale, looking it up again")
+                    radio_btn = find_row_radio_buttons(driver).get(selected_number['radio_index'])
+                    if radio_btn is None:
+                        logger.error(f"Radio button for row {selected_number['radio_index']} not found")
+                        return None
+                    radio_btn.click()
                 logger.info(f"✅ Selected phone number: {selected_number['phone_number']}")
-                time.sleep(1)
+                try:
+                    WebDriverWait(driver, 5).until(EC.element_to_be_selected(radio_btn))
+                except TimeoutException:
+                    logger.warning(f"Radio button for {selected_number['phone_number']} did not report as selected")
                 
                 # Save selected number details
-                with open("selected_phone_number.json", "w") as f:
-                    json.dump(selected_number, f, indent=2)
+                with open("selected_phone_number.json", "wb") as f:
+                    f.write(orjson.dumps(selected_number, option=orjson.OPT_INDENT_2))
                 logger.info("💾 Saved selected phone number details")
                 
                 return selected_number
             else:
-                logger.error(f"Radio button index {selected_number['radio_index']} out of range")
+                logger.error(f"Radio button for row {selected_number['radio_index']} not found")
                 return None
                 
         except Exception as e:
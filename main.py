@@ -14,29 +14,51 @@ Phases:
 """
 import os
 import sys
+import re
+import ast
 import json
+import base64
+import hashlib
+import tempfile
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import webbrowser
 import urllib.parse
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import time
+import random
+import atexit
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from twilio.rest import Client as TwilioClient
+from twilio.http.http_client import TwilioHttpClient
 from twilio.base.exceptions import TwilioRestException
 import pytz
-import jwt
+import orjson
 
 # Import the Phone_Number_Purchase function from login_ghl
 from login_ghl import Phone_Number_Purchase
 
+# ZIP code -> area code lookup is optional (needs the OpenAI client)
+try:
+    import area_code as area_code_module
+except ImportError:
+    area_code_module = None
+
 # Load environment variables
 load_dotenv()
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format='%(asctime)s - %(name)s - %(threadName)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout)
     ]
@@ -51,9 +73,20 @@ GHL_BASE_URL = "https://marketplace.gohighlevel.com"  # Updated to match working
 GHL_API_BASE_URL = "https://services.leadconnectorhq.com"
 GHL_FORM_ID = os.getenv("GHL_FORM_ID", "28wKJpL0zNImn9bYVPSN")  # Default to your Client Onboarding form
 
+# Persisted OAuth tokens, next to the script so reruns from any working directory (and the
+# get_token.py refresh cron) share one file instead of falling back to the interactive flow
+TOKEN_FILE = os.getenv("GHL_TOKEN_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tokens.json"))
+
+# Re-fetch the user after the Phase 4 phone update when the PUT response doesn't echo the phone (QA runs)
+VERIFY_PHONE_ASSIGNMENT = os.getenv("VERIFY_PHONE_ASSIGNMENT", "0") == "1"
+
 # Agency API Key for User Creation (different from OAuth)
 GHL_AGENCY_API_KEY = os.getenv("GHL_AGENCY_API_KEY")  # Required for creating users
 
+# Settings main() can't run without, checked once when the configuration is read
+MISSING_REQUIRED_VARS = tuple(name for name, value in (("GHL_CLIENT_ID", GHL_CLIENT_ID),
+                                                       ("GHL_CLIENT_SECRET", GHL_CLIENT_SECRET)) if not value)
+
 # Twilio Configuration for Phase 3
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
@@ -69,6 +102,45 @@ OAUTH_SCOPES = [
     "users.readonly"  # Add scope for user management
 ]
 
+# GHL token endpoint and retry policies for transient failures, honouring Retry-After.
+# Auth codes and refresh tokens are single-use, so a token grant is only retried when the
+# server cannot have processed it (connection never made, or 429); a 5xx or a lost response
+# may already have consumed the token. Other API calls retry idempotent methods on 5xx;
+# their 429s are retried by make_api_request, which also tracks the rate-limit headers.
+GHL_TOKEN_URL = f"{GHL_API_BASE_URL}/oauth/token"
+# The users API requires a newer Version header than the rest of the API
+GHL_USERS_API_VERSION = "2021-07-28"
+RETRY_STATUS_CODES = [500, 502, 503, 504]
+GHL_TOKEN_RETRY = Retry(total=4, connect=4, read=0, other=0, backoff_factor=0.4, status_forcelist=[429],
+                        allowed_methods=frozenset(["POST", "GET"]), respect_retry_after_header=True,
+                        raise_on_status=False)
+GHL_API_RETRY = Retry(total=4, backoff_factor=0.4, status_forcelist=RETRY_STATUS_CODES,
+                      allowed_methods=frozenset(["GET", "PUT", "DELETE"]), respect_retry_after_header=True,
+                      raise_on_status=False)
+
+# (connect, read) timeouts so a hung GHL endpoint can't block onboarding or starve the pool
+GHL_REQUEST_TIMEOUT = (5, 15)
+
+# Seconds before a Twilio API request is abandoned
+TWILIO_REQUEST_TIMEOUT = 15
+
+# Form field definitions are reused for 5 minutes, then served stale (and refreshed
+# in the background) for up to an hour
+FORM_FIELDS_TTL = 5 * 60
+FORM_FIELDS_MAX_STALE = 60 * 60
+
+# Largest page the form submissions API returns
+FORM_SUBMISSIONS_PAGE_SIZE = 100
+
+# GHL allows a burst of 100 API requests per 10 seconds per location
+GHL_RATE_LIMIT_REQUESTS = 100
+GHL_RATE_LIMIT_WINDOW = 10  # seconds
+# Pause for a window once fewer than this fraction of the quota is left
+GHL_RATE_LIMIT_LOW_WATERMARK = 0.1
+
+# Refresh GHL access tokens this long before they expire
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
 # Default phone number preferences
 DEFAULT_PHONE_PREFERENCES = {
     'country_code': 'US',
@@ -79,9 +151,328 @@ DEFAULT_PHONE_PREFERENCES = {
     'limit': 10
 }
 
+# number_type -> available_phone_numbers list resource
+NUMBER_TYPE_ACCESSORS = {
+    'local': lambda available: available.local,
+    'tollfree': lambda available: available.toll_free,
+    'mobile': lambda available: available.mobile
+}
+
+# search_available_numbers() arguments used when no phone preferences are given
+DEFAULT_SEARCH_PARAMS = {
+    key: DEFAULT_PHONE_PREFERENCES[key]
+    for key in ('country_code', 'sms_enabled', 'voice_enabled', 'mms_enabled', 'limit', 'number_type')
+}
+
+# Upper bound on clients onboarded concurrently by process_recent_form_submissions_with_phone
+ONBOARDING_MAX_WORKERS = 8
+
+# Serializes Phone_Number_Purchase (one Selenium CRM session at a time)
+_phone_purchase_lock = threading.Lock()
+
+# Approved Trust Hub Customer Profile bundles used for A2P brand registration
+A2P_CUSTOMER_PROFILE_BUNDLE_SID = "BU9c2200a4c9ea4a5155572e7bf6f574fc"  # Your approved customer profile
+A2P_PROFILE_BUNDLE_SID = "BU872cda290512475cf46f56c6e1ddc5e3"  # Your second approved customer profile
+
+# Brand registration outcome per (customer profile, A2P profile) bundle pair for this run
+_brand_registration_cache = {}
+_brand_registration_lock = threading.Lock()
+
+# Consecutive provider failures that open a circuit breaker, and how long it stays open
+CIRCUIT_BREAKER_FAILURES = 3
+CIRCUIT_BREAKER_COOLDOWN = 60  # seconds
+
+# Short-lived cache of available-number searches: key -> (timestamp, results)
+NUMBER_SEARCH_CACHE_TTL = 60  # seconds
+NUMBER_SEARCH_CACHE_MAXSIZE = 256
+_number_search_cache = {}
+_number_search_cache_lock = threading.Lock()
+
+class RateLimiter:
+    """Thread-safe token bucket: allows `rate` calls per `per` seconds, blocking callers that exceed it"""
+    
+    def __init__(self, rate, per=1.0):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+            self.updated_at = now
+            # Reserve the token now; a negative balance queues later callers behind us
+            self.tokens -= 1
+            wait = -self.tokens / self.fill_rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit (additive increase, multiplicative decrease).
+    The limit grows while calls succeed within the target latency and shrinks on failures.
+    """
+    
+    def __init__(self, initial=2, minimum=1, maximum=8, increase=0.5, decrease=0.5,
+                 target_latency=5.0, window=20):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._condition = threading.Condition()
+    
+    @contextmanager
+    def slot(self):
+        """Hold one of the currently allowed concurrent slots"""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+    
+    def record(self, latency, success):
+        """Adjust the limit from the outcome of one call"""
+        with self._condition:
+            self._latencies.append(latency)
+            average_latency = sum(self._latencies) / len(self._latencies)
+            if not success:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            elif average_latency <= self.target_latency:
+                self.limit = min(self.maximum, self.limit + self.increase)
+            self._condition.notify_all()
+    
+    def call(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) in a slot; an exception or a None result (how the GHL
+        helpers report a final 429/5xx or other failure) counts against the limit"""
+        with self.slot():
+            started = time.perf_counter()
+            result = None
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            finally:
+                self.record(time.perf_counter() - started, result is not None)
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Token bucket whose rate follows the API's responses: it creeps up while calls succeed
+    and is cut on 429/5xx, with callers paused for Retry-After (plus jitter) on a 429
+    """
+    
+    def __init__(self, rate, per=1.0, minimum=None, maximum=None, increase=0.25, decrease=0.5):
+        super().__init__(rate, per)
+        self.min_fill_rate = (minimum if minimum is not None else rate / 4) / per
+        self.max_fill_rate = (maximum if maximum is not None else rate) / per
+        self.increase = increase
+        self.decrease = decrease
+    
+    def record_response(self, response, *args, **kwargs):
+        """requests response hook: adjust the rate from one response"""
+        status = response.status_code
+        with self._lock:
+            # Settle the bucket at the old rate up to now, so the new rate and any
+            # Retry-After pause only apply from this response onwards
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+            self.updated_at = now
+            if status == 429 or status >= 500:
+                self.fill_rate = max(self.min_fill_rate, self.fill_rate * self.decrease)
+                if status == 429:
+                    # Drive the balance negative so every caller waits out Retry-After
+                    pause = _retry_after_seconds(response) + random.uniform(0, 1 / self.fill_rate)
+                    self.tokens = min(self.tokens, 0) - pause * self.fill_rate
+            elif status < 400:
+                self.fill_rate = min(self.max_fill_rate, self.fill_rate + self.increase)
+        return response
+
+class CircuitBreakerOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open"""
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker: after `failure_threshold` consecutive failures the circuit opens
+    and calls fail fast for `cooldown` seconds, then a single trial call decides whether it closes again
+    """
+    
+    def __init__(self, name, failure_threshold=CIRCUIT_BREAKER_FAILURES, cooldown=CIRCUIT_BREAKER_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    def call(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) through the breaker, raising CircuitBreakerOpenError while it is open"""
+        with self._lock:
+            if self.state == "open":
+                remaining = self.cooldown - (time.monotonic() - self.opened_at)
+                if remaining > 0:
+                    raise CircuitBreakerOpenError(f"{self.name} circuit open, retrying in {remaining:.0f}s")
+                self.state = "half-open"
+            elif self.state == "half-open":
+                raise CircuitBreakerOpenError(f"{self.name} circuit half-open, trial call in progress")
+        
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failures += 1
+                if self.state == "half-open" or self.failures >= self.failure_threshold:
+                    if self.state != "open":
+                        logger.warning("%s circuit opened after %s consecutive failures", self.name, self.failures)
+                    self.state = "open"
+                    self.opened_at = time.monotonic()
+            raise
+        
+        with self._lock:
+            if self.state != "closed":
+                logger.info("%s circuit closed", self.name)
+            self.state = "closed"
+            self.failures = 0
+        return result
+
+# Admission for GHL user and calendar creation across concurrently onboarded clients
+ghl_write_limiter = AIMDLimiter(maximum=ONBOARDING_MAX_WORKERS)
+
+# Keep Twilio traffic below the account limits (A2P registration endpoints are stricter)
+twilio_limiter = AdaptiveRateLimiter(10, 1.0)
+a2p_limiter = RateLimiter(1, 1.0)
+
+# Fail fast on the remaining clients of a batch while a provider is down
+twilio_breaker = CircuitBreaker("Twilio")
+phone_purchase_breaker = CircuitBreaker("CRM phone purchase")
+
+# Twilio clients keyed by (account_sid, auth_token) so every manager shares one keep-alive pool
+_TWILIO_CLIENT_CACHE = {}
+
+def get_twilio_client(account_sid, auth_token):
+    """
+    Return a shared Twilio client for the given credentials, creating it on first use
+    
+    Args:
+        account_sid (str): Twilio Account SID
+        auth_token (str): Twilio Auth Token
+    
+    Returns:
+        TwilioClient: Cached client backed by a pooled HTTP session
+    """
+    key = (account_sid, auth_token)
+    client = _TWILIO_CLIENT_CACHE.get(key)
+    if client is None:
+        http_client = TwilioHttpClient(pool_connections=True, timeout=TWILIO_REQUEST_TIMEOUT,
+                                       request_hooks={"response": twilio_limiter.record_response})
+        http_client.session.mount("https://", HTTPAdapter(pool_maxsize=50))
+        client = TwilioClient(account_sid, auth_token, http_client=http_client)
+        _TWILIO_CLIENT_CACHE[key] = client
+    return client
+
+def _unverified_claims(token):
+    """
+    Read the claims of a JWT without verifying its signature
+    
+    Args:
+        token (str): Encoded JWT
+    
+    Returns:
+        dict: Decoded payload claims
+    
+    Raises:
+        ValueError: If the token is not a well-formed JWT
+    """
+    try:
+        payload = token.split('.')[1]
+    except (AttributeError, IndexError):
+        raise ValueError("Token is not a JWT")
+    return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+
+def _retry_after_seconds(response, default=1):
+    """
+    Read the Retry-After header of a throttled response
+    
+    Args:
+        response (requests.Response): Response with status 429
+        default (int): Seconds to wait when the header is missing or not a number
+    
+    Returns:
+        int: Seconds to wait before retrying
+    """
+    try:
+        return max(0, int(response.headers.get("Retry-After", default)))
+    except ValueError:
+        return default
+
+NON_DIGIT_RE = re.compile(r"\D")
+
+# GHL resource IDs (20-character alphanumeric) in an API path, e.g. the user ID in "/users/<id>"
+API_PATH_ID_RE = re.compile(r'/[A-Za-z0-9]{16,}(?=/|$)')
+
+# Working-hours time range with optional minutes and AM/PM on either side,
+# e.g. "9am-5pm", "09:00-17:00", "12 to 2", "12:30 to 3:50"
+TIME_RANGE_RE = re.compile(r'(\d{1,2})(?::(\d{1,2}))?\s*(am|pm)?\s*(?:[-to]+)\s*(\d{1,2})(?::(\d{1,2}))?\s*(am|pm)?')
+
+# Area code of a CRM-formatted number such as "+1 214-555-0100"
+DISPLAY_AREA_CODE_RE = re.compile(r'\+\d\s(\d{3})')
+
+# First three consecutive digits of an area code field
+AREA_CODE_RE = re.compile(r'\d{3}')
+
+# A single time with optional minutes, seconds (ignored) and AM/PM, e.g. "9", "9:30", "5pm", "12:15 am", "17:00:00"
+TIME_AMPM_RE = re.compile(r'^\s*(\d{1,2})(?::(\d{1,2})(?::\d{1,2})?)?\s*(am|pm)?\s*$', re.IGNORECASE)
+
+# Separator between the start and end of a working-hours range, e.g. "9 - 5", "9-5", "12 to 2"
+HOURS_SEPARATOR_RE = re.compile(r'\s*(?:-|\bto\b)\s*', re.IGNORECASE)
+
+# Lowercase weekday names, matched anywhere in a "which days do you work" answer
+DAY_NAME_RE = re.compile(r'monday|tuesday|wednesday|thursday|friday|saturday|sunday')
+
+def normalize_phone_number(phone):
+    """
+    Convert a phone number to E.164, assuming US (+1) when no country code is given
+    
+    Args:
+        phone (str): Phone number in any common format
+    
+    Returns:
+        str: Phone number in E.164 format
+    """
+    digits = NON_DIGIT_RE.sub("", phone)
+    if phone.startswith('+') or (len(digits) == 11 and digits.startswith('1')):
+        return '+' + digits
+    return '+1' + digits
+
+@lru_cache(maxsize=4096)
+def area_code_of(phone_number):
+    """
+    Area code of a purchased number, cached per number
+    
+    Args:
+        phone_number (str): CRM-formatted ("+1 214-555-0100") or E.164 ("+12145550100") number
+    
+    Returns:
+        str: The three-digit area code
+    """
+    area_code_match = DISPLAY_AREA_CODE_RE.match(phone_number)
+    return area_code_match.group(1) if area_code_match else phone_number[2:5]
+
 class TwilioPhoneManager:
     """Class to handle Twilio phone number purchasing and management"""
     
+    __slots__ = ('account_sid', 'auth_token', 'client')
+    
     def __init__(self, account_sid=None, auth_token=None):
             
         self.account_sid = account_sid or TWILIO_ACCOUNT_SID
@@ -90,7 +481,7 @@ class TwilioPhoneManager:
         if not self.account_sid or not self.auth_token:
             raise ValueError("Twilio credentials not provided. Set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN environment variables.")
         
-        self.client = TwilioClient(self.account_sid, self.auth_token)
+        self.client = get_twilio_client(self.account_sid, self.auth_token)
         logger.info("Twilio client initialized successfully")
     
     def search_available_numbers(self, country_code="US", area_code=None, contains=None, 
@@ -113,53 +504,32 @@ class TwilioPhoneManager:
             list: Available phone numbers with their details
         """
         try:
-            search_params = {
-                'page_size': limit
-            }
+            # Serve identical searches from the short-lived cache
+            cache_key = (country_code, number_type.lower(), area_code, contains,
+                         sms_enabled, voice_enabled, mms_enabled, limit)
+            with _number_search_cache_lock:
+                cached = _number_search_cache.get(cache_key)
+            if cached and time.time() - cached[0] < NUMBER_SEARCH_CACHE_TTL:
+                logger.info(f"Using cached search results ({len(cached[1])} {number_type} numbers in {country_code})")
+                return list(cached[1])
+            
+            results = list(itertools.islice(
+                self.iter_available_numbers(country_code, area_code, contains, sms_enabled,
+                                            voice_enabled, mms_enabled, limit, number_type),
+                limit
+            ))
             
-            # Only add boolean parameters if they are True (Twilio API doesn't like False values)
-            if sms_enabled:
-                search_params['sms_enabled'] = True
-            if voice_enabled:
-                search_params['voice_enabled'] = True
-            if mms_enabled:
-                search_params['mms_enabled'] = False
-            
-            if area_code:
-                search_params['area_code'] = area_code
-            if contains:
-                search_params['contains'] = contains
-            
-            # Search based on number type
-            if number_type.lower() == "local":
-                available_numbers = self.client.available_phone_numbers(country_code).local.list(**search_params)
-            elif number_type.lower() == "tollfree":
-                available_numbers = self.client.available_phone_numbers(country_code).toll_free.list(**search_params)
-            elif number_type.lower() == "mobile":
-                available_numbers = self.client.available_phone_numbers(country_code).mobile.list(**search_params)
-            else:
-                raise ValueError(f"Invalid number_type: {number_type}. Use 'local', 'tollfree', or 'mobile'")
+            logger.info(f"Found {len(results)} available {number_type} numbers in {country_code}")
             
-            results = []
-            for number in available_numbers:
-                results.append({
-                    'phone_number': number.phone_number,
-                    'friendly_name': number.friendly_name,
-                    'locality': getattr(number, 'locality', None),
-                    'region': getattr(number, 'region', None),
-                    'postal_code': getattr(number, 'postal_code', None),
-                    'iso_country': number.iso_country,
-                    'capabilities': {
-                        'voice': number.capabilities.get('voice', False),
-                        'sms': number.capabilities.get('sms', False),
-                        'mms': number.capabilities.get('mms', False)
-                    },
-                    'address_requirements': getattr(number, 'address_requirements', 'none'),
-                    'beta': getattr(number, 'beta', False)
-                })
+            if results:
+                # Onboarding threads share the cache, so evict and insert under the lock
+                with _number_search_cache_lock:
+                    if len(_number_search_cache) >= NUMBER_SEARCH_CACHE_MAXSIZE:
+                        # Drop the oldest entry (dicts keep insertion order)
+                        _number_search_cache.pop(next(iter(_number_search_cache)))
+                    _number_search_cache[cache_key] = (time.time(), results)
             
-            logger.info(f"Found {len(results)} available {number_type} numbers in {country_code}")
-            return results
+            return list(results)
             
         except TwilioRestException as e:
             logger.error(f"Twilio API error searching numbers: {e}")
@@ -168,6 +538,86 @@ class TwilioPhoneManager:
             logger.error(f"Error searching available numbers: {e}")
             return []
     
+    def iter_available_numbers(self, country_code="US", area_code=None, contains=None,
+                               sms_enabled=True, voice_enabled=True, mms_enabled=False,
+                               limit=20, number_type="local"):
+        """
+        Stream available phone numbers from Twilio without caching, yielding each as it arrives
+        
+        Takes the same arguments as search_available_numbers; errors are raised, not logged.
+        
+        Returns:
+            generator: Details dicts for the available numbers
+        """
+        search_params = {
+            'page_size': limit
+        }
+        
+        # Only add boolean parameters if they are True (Twilio API doesn't like False values)
+        if sms_enabled:
+            search_params['sms_enabled'] = True
+        if voice_enabled:
+            search_params['voice_enabled'] = True
+        if mms_enabled:
+            search_params['mms_enabled'] = False
+        
+        if area_code:
+            search_params['area_code'] = area_code
+        if contains:
+            search_params['contains'] = contains
+        
+        # Search based on number type
+        number_type_accessor = NUMBER_TYPE_ACCESSORS.get(number_type.lower())
+        if number_type_accessor is None:
+            raise ValueError(f"Invalid number_type: {number_type}. Use 'local', 'tollfree', or 'mobile'")
+        twilio_limiter.acquire()
+        available_numbers = number_type_accessor(self.client.available_phone_numbers(country_code)).stream(
+            limit=limit, **search_params
+        )
+        return self._iter_number_details(available_numbers)
+    
+    def first_available_number(self, **search_kwargs):
+        """
+        Fetch just the first available number for a purchase
+        
+        Streams a single record instead of a full result page, and skips the search cache so
+        concurrent onboardings don't all try to buy the same cached number.
+        
+        Args:
+            **search_kwargs: Arguments as for search_available_numbers (limit is ignored)
+        
+        Returns:
+            dict: Details of the first available number, or None if there is none or the search failed
+        """
+        try:
+            return next(self.iter_available_numbers(**{**search_kwargs, 'limit': 1}), None)
+        except TwilioRestException as e:
+            logger.error(f"Twilio API error searching numbers: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error searching available numbers: {e}")
+            return None
+    
+    @staticmethod
+    def _iter_number_details(numbers):
+        """Yield a details dict for each available-number record as it is streamed"""
+        for number in numbers:
+            yield {
+                'phone_number': number.phone_number,
+                'friendly_name': number.friendly_name,
+                'locality': number.locality,
+                'region': number.region,
+                'postal_code': number.postal_code,
+                'iso_country': number.iso_country,
+                'capabilities': {
+                    'voice': number.capabilities.get('voice', False),
+                    'sms': number.capabilities.get('sms', False),
+                    'mms': number.capabilities.get('mms', False)
+                },
+                'address_requirements': number.address_requirements,
+                'beta': number.beta
+            }
+    
     def purchase_phone_number(self, phone_number, friendly_name=None, voice_url=None, 
                              sms_url=None, status_callback=None):
         """
@@ -197,6 +647,7 @@ class TwilioPhoneManager:
             if status_callback:
                 purchase_params['status_callback'] = status_callback
             
+            twilio_limiter.acquire()
             purchased_number = self.client.incoming_phone_numbers.create(**purchase_params)
             
             result = {
@@ -218,6 +669,10 @@ class TwilioPhoneManager:
             logger.info(f"Successfully purchased phone number: {phone_number}")
             logger.info(f"Number SID: {purchased_number.sid}")
             
+            # Cached search results may still list the number we just bought
+            with _number_search_cache_lock:
+                _number_search_cache.clear()
+            
             return result
             
         except TwilioRestException as e:
@@ -238,7 +693,9 @@ class TwilioPhoneManager:
             list: List of owned phone numbers
         """
         try:
-            numbers = self.client.incoming_phone_numbers.list(limit=limit)
+            twilio_limiter.acquire()
+            # Fetch up to 1000 numbers per page instead of the SDK default of 50
+            numbers = self.client.incoming_phone_numbers.stream(limit=limit, page_size=min(limit, 1000))
             
             results = []
             for number in numbers:
@@ -254,7 +711,7 @@ class TwilioPhoneManager:
                     'date_created': number.date_created,
                     'voice_url': number.voice_url,
                     'sms_url': number.sms_url,
-                    'status': getattr(number, 'status', 'active')
+                    'status': number.status
                 })
             
             logger.info(f"Retrieved {len(results)} phone numbers from account")
@@ -298,6 +755,7 @@ class TwilioPhoneManager:
                 logger.warning("No parameters provided for phone number update")
                 return None
             
+            twilio_limiter.acquire()
             updated_number = self.client.incoming_phone_numbers(number_sid).update(**update_params)
             
             result = {
@@ -330,6 +788,7 @@ class TwilioPhoneManager:
             bool: True if successful, False otherwise
         """
         try:
+            twilio_limiter.acquire()
             self.client.incoming_phone_numbers(number_sid).delete()
             logger.info(f"Successfully released phone number with SID: {number_sid}")
             return True
@@ -352,42 +811,37 @@ class TwilioPhoneManager:
         Returns:
             dict: Purchased phone number details or None if failed
         """
-        if preferences is None:
-            preferences = DEFAULT_PHONE_PREFERENCES
-        
         # Extract location preferences from client data
         client_state = client_data.get('state', '').upper()
         client_city = client_data.get('city', '')
         client_zip = client_data.get('postalCode', '')
         business_name = client_data.get('businessName', client_data.get('companyName', 'Client'))
         
-        # Default search preferences
-        search_params = {
-            'country_code': preferences.get('country_code', 'US'),
-            'sms_enabled': preferences.get('sms_enabled', True),
-            'voice_enabled': preferences.get('voice_enabled', True),
-            'mms_enabled': preferences.get('mms_enabled', False),
-            'limit': preferences.get('limit', 10),
-            'number_type': preferences.get('number_type', 'local')
-        }
+        # Default search preferences (shared dict, never mutated)
+        if preferences is None:
+            search_params = DEFAULT_SEARCH_PARAMS
+        else:
+            search_params = {key: preferences.get(key, default) for key, default in DEFAULT_SEARCH_PARAMS.items()}
+            if preferences.get('area_code'):
+                search_params['area_code'] = preferences['area_code']
         
         logger.info(f"Searching for phone numbers for client: {business_name}")
         logger.info(f"Search parameters: {search_params}")
         
-        # Search for available numbers
-        available_numbers = self.search_available_numbers(**search_params)
+        # Only the first match is bought, so fetch just that one
+        selected_number = self.first_available_number(**search_params)
         
-        if not available_numbers:
+        if not selected_number:
             logger.warning("No available numbers found with specified criteria")
-            # Try broader search without location restrictions
-            available_numbers = self.search_available_numbers(**search_params)
+            # Try broader search without the area code (capability requirements are kept)
+            broader_params = {k: v for k, v in search_params.items() if k != 'area_code'}
+            logger.info(f"Retrying with broader search parameters: {broader_params}")
+            selected_number = self.first_available_number(**broader_params)
         
-        if not available_numbers:
+        if not selected_number:
             logger.error("No available numbers found")
             return None
         
-        # Select the first available number
-        selected_number = available_numbers[0]
         phone_number = selected_number['phone_number']
         
         # Create friendly name
@@ -414,30 +868,40 @@ class TwilioPhoneManager:
         return purchased
     
     def register_a2p_brand(self, client_data):
-        """Register A2P 10DLC brand with Twilio"""
-        try:
-            logger.info("Starting A2P 10DLC brand registration...")
-            
-            # Use actual approved Trust Hub bundles
-            # Note: For A2P, both bundles should be Customer Profile bundles
-            brand_registration = self.client.messaging.v1.brand_registrations.create(
-                customer_profile_bundle_sid="BU9c2200a4c9ea4a5155572e7bf6f574fc",  # Your approved customer profile
-                a2p_profile_bundle_sid="BU872cda290512475cf46f56c6e1ddc5e3",  # Your second approved customer profile
-                brand_type='STANDARD',
-                mock=False  # Use real registration
-            )
+        """Register A2P 10DLC brand with Twilio (once per bundle pair per run)"""
+        bundle_key = (A2P_CUSTOMER_PROFILE_BUNDLE_SID, A2P_PROFILE_BUNDLE_SID)
+        # Held across the REST call so concurrent onboardings don't race to create the same brand
+        with _brand_registration_lock:
+            if bundle_key in _brand_registration_cache:
+                logger.info("Reusing A2P brand registration result from earlier in this run")
+                return _brand_registration_cache[bundle_key]
             
-            logger.info(f"A2P brand registration created: {brand_registration.sid}")
-            return brand_registration
+            try:
+                logger.info("Starting A2P 10DLC brand registration...")
+                
+                # Use actual approved Trust Hub bundles
+                # Note: For A2P, both bundles should be Customer Profile bundles
+                a2p_limiter.acquire()
+                brand_registration = self.client.messaging.v1.brand_registrations.create(
+                    customer_profile_bundle_sid=A2P_CUSTOMER_PROFILE_BUNDLE_SID,
+                    a2p_profile_bundle_sid=A2P_PROFILE_BUNDLE_SID,
+                    brand_type='STANDARD',
+                    mock=False  # Use real registration
+                )
+                
+                logger.info(f"A2P brand registration created: {brand_registration.sid}")
+                
+            except Exception as e:
+                # Handle duplicate brand error gracefully (expected in testing)
+                if "Duplicate Brand" in str(e):
+                    logger.info(f"Brand already exists (duplicate detected) - this is expected for testing")
+                    brand_registration = None
+                else:
+                    logger.error(f"Error registering A2P brand: {str(e)}")
+                    raise
             
-        except Exception as e:
-            # Handle duplicate brand error gracefully (expected in testing)
-            if "Duplicate Brand" in str(e):
-                logger.info(f"Brand already exists (duplicate detected) - this is expected for testing")
-                return None
-            else:
-                logger.error(f"Error registering A2P brand: {str(e)}")
-                raise
+            _brand_registration_cache[bundle_key] = brand_registration
+            return brand_registration
 
     def register_a2p_campaign(self, brand_registration_sid, messaging_service_sid):
         """Register A2P 10DLC campaign with Twilio"""
@@ -445,6 +909,7 @@ class TwilioPhoneManager:
             logger.info("Starting A2P 10DLC campaign registration...")
             
             # Create campaign registration using the correct UsAppToPerson API
+            a2p_limiter.acquire()
             campaign_registration = self.client.messaging.v1.services(messaging_service_sid).us_app_to_person.create(
                 brand_registration_sid=brand_registration_sid,
                 us_app_to_person_usecase="MIXED",  # Mixed use case for business communications
@@ -467,22 +932,27 @@ class TwilioPhoneManager:
             logger.error(f"Error registering A2P campaign: {str(e)}")
             raise
 
-    def register_a2p_10dlc(self, client_data):
-        """Complete A2P 10DLC registration workflow"""
+    def create_messaging_service(self, friendly_name):
+        """Create a Twilio messaging service"""
+        twilio_limiter.acquire()
+        return self.client.messaging.v1.services.create(friendly_name=friendly_name)
+    
+    def register_a2p_10dlc(self, client_data, *, phone_number=None):
+        """Complete A2P 10DLC registration workflow (phone_number is the number being registered, if known)"""
+        messaging_service = None
         try:
-            logger.info("Starting complete A2P 10DLC registration...")
+            logger.info("Starting complete A2P 10DLC registration%s...", f" for {phone_number}" if phone_number else "")
             
             # Extract business name from client data
             business_name = client_data.get('companyName') or client_data.get('business_name') or 'Client'
             
             # First, we need to create a messaging service for the campaign
-            messaging_service = self.client.messaging.v1.services.create(
-                friendly_name=f"A2P Service for {business_name}"
-            )
+            messaging_service = self.create_messaging_service(f"A2P Service for {business_name}")
             
             logger.info(f"Created messaging service: {messaging_service.sid}")
             
-            # Register brand first
+            # Register the brand only once the service exists, so a failed service
+            # creation never leaves a billable brand registration behind
             brand_registration = self.register_a2p_brand(client_data)
             
             # Brand registration is complete - no need to create campaign for now
@@ -492,6 +962,7 @@ class TwilioPhoneManager:
             # Add phone number to messaging service if available
             if client_data.get('phone_number_sid'):
                 try:
+                    twilio_limiter.acquire()
                     self.client.messaging.v1.services(messaging_service.sid).phone_numbers.create(
                         phone_number_sid=client_data['phone_number_sid']
                     )
@@ -528,6 +999,12 @@ class TwilioPhoneManager:
 class GoHighLevelOAuth:
     """Class to handle Go High Level OAuth 2.0 authentication and API calls"""
     
+    __slots__ = ('client_id', 'client_secret', 'redirect_uri', 'base_url', 'api_base_url',
+                 'access_token', 'refresh_token', 'location_id', 'company_id', '_token_expires_at', '_refresh_after',
+                 'session', '_request_times', '_rate_limited_until', '_rate_limit_lock', '_endpoint_locks',
+                 '_form_fields_cache', '_form_fields_refreshing', '_headers_cache', '_headers_cache_token',
+                 '_auth_url_prefix', '_refresh_lock')
+    
     def __init__(self, client_id, client_secret, redirect_uri):
         self.client_id = client_id
         self.client_secret = client_secret
@@ -540,31 +1017,105 @@ class GoHighLevelOAuth:
         self.company_id = None
         self.token_expires_at = None
         
-    def get_authorization_url(self, scopes=None, state=None):
-        """Generate the authorization URL for OAuth flow"""
-        if scopes is None:
-            scopes = OAUTH_SCOPES
-            
+        # Reuse TCP/TLS connections across token and API requests
+        self.session = requests.Session()
+        api_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=GHL_API_RETRY)
+        self.session.mount("https://", api_adapter)
+        self.session.mount("http://", api_adapter)
+        self.session.mount(GHL_TOKEN_URL, HTTPAdapter(max_retries=GHL_TOKEN_RETRY))
+        
+        # Sliding window of recent API request times, plus a pause set from rate-limit headers
+        self._request_times = deque(maxlen=GHL_RATE_LIMIT_REQUESTS)
+        self._rate_limited_until = 0.0
+        self._rate_limit_lock = threading.Lock()
+        self._endpoint_locks = {}
+        
+        # Form field definitions: form_id -> (fetched_at, fields), and forms being refreshed
+        self._form_fields_cache = {}
+        self._form_fields_refreshing = set()
+        
+        # Headers for the current access token, rebuilt when the token changes
+        self._headers_cache = None
+        self._headers_cache_token = None
+        
+        # Only the state parameter varies between authorization URLs
+        self._auth_url_prefix = self._build_auth_url_prefix(OAUTH_SCOPES)
+        
+        # Serializes token refreshes so concurrent callers don't each hit /oauth/token
+        self._refresh_lock = threading.Lock()
+        
+    def _build_auth_url_prefix(self, scopes):
+        """Build the authorization URL up to (but not including) the state parameter"""
         params = {
             "response_type": "code",
             "client_id": self.client_id,
             "redirect_uri": self.redirect_uri,
             "scope": " ".join(scopes)
         }
+        # Use the working OAuth endpoint from your example
+        return f"{self.base_url}/oauth/chooselocation?" + urllib.parse.urlencode(params)
+    
+    def close(self):
+        """Close the pooled HTTP session"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def get_authorization_url(self, scopes=None, state=None):
+        """Generate the authorization URL for OAuth flow"""
+        if scopes is None:
+            auth_url = self._auth_url_prefix
+        else:
+            auth_url = self._build_auth_url_prefix(scopes)
         
         if state:
-            params["state"] = state
-            
-        # Use the working OAuth endpoint from your example
-        auth_url = f"{self.base_url}/oauth/chooselocation?" + urllib.parse.urlencode(params)
+            auth_url += "&" + urllib.parse.urlencode({"state": state})
         
         logger.info(f"Generated auth URL: {auth_url}")
         return auth_url
     
+    def _update_token_metadata(self, token_data):
+        """Fill in location/company IDs and expiry, decoding the JWT only when the response lacks them"""
+        expires_in = token_data.get("expires_in")
+        if self.location_id and self.company_id and expires_in:
+            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            return
+        
+        # Try to extract additional information from token if possible
+        try:
+            decoded_token = _unverified_claims(self.access_token)
+        
+            # Extract location ID if not already available
+            if not self.location_id and 'authClassId' in decoded_token:
+                self.location_id = decoded_token['authClassId']
+                logger.info(f"Extracted location_id from token: {self.location_id}")
+        
+            # Extract company ID if available in token
+            if not self.company_id and 'companyId' in decoded_token:
+                self.company_id = decoded_token['companyId']
+                logger.info(f"Extracted company_id from token: {self.company_id}")
+        
+            # Calculate token expiration time from token if available
+            if 'exp' in decoded_token:
+                self.token_expires_at = datetime.fromtimestamp(decoded_token['exp'])
+            else:
+                # Default to 24 hours if not in token
+                expires_in = token_data.get("expires_in", 86400)
+                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+        except Exception as e:
+            logger.warning(f"Could not extract additional data from token: {e}")
+            # Fall back to standard expiration calculation
+            expires_in = token_data.get("expires_in", 86400)
+            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+    
     def exchange_code_for_token(self, authorization_code, user_type="Location"):
         """Exchange authorization code for access token"""
         # Use services.leadconnectorhq.com for token exchange
-        token_url = "https://services.leadconnectorhq.com/oauth/token"
+        token_url = GHL_TOKEN_URL
         
         data = {
             "client_id": self.client_id,
@@ -576,7 +1127,7 @@ class GoHighLevelOAuth:
         
         try:
             # Make request without headers as in get_token.py
-            response = requests.post(token_url, data=data)
+            response = self.session.post(token_url, data=data, timeout=GHL_REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -585,33 +1136,7 @@ class GoHighLevelOAuth:
                 self.location_id = token_data.get("locationId")
                 self.company_id = token_data.get("companyId")
                 
-                # Try to extract additional information from token if possible
-                try:
-                    # Parse JWT token to extract additional data
-                    decoded_token = jwt.decode(self.access_token, options={"verify_signature": False})
-                    
-                    # Extract location ID if not already available
-                    if not self.location_id and 'authClassId' in decoded_token:
-                        self.location_id = decoded_token['authClassId']
-                        logger.info(f"Extracted location_id from token: {self.location_id}")
-                    
-                    # Extract company ID if available in token
-                    if not self.company_id and 'companyId' in decoded_token:
-                        self.company_id = decoded_token['companyId']
-                        logger.info(f"Extracted company_id from token: {self.company_id}")
-                    
-                    # Calculate token expiration time from token if available
-                    if 'exp' in decoded_token:
-                        self.token_expires_at = datetime.fromtimestamp(decoded_token['exp'])
-                    else:
-                        # Default to 24 hours if not in token
-                        expires_in = token_data.get("expires_in", 86400)
-                        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
-                except Exception as e:
-                    logger.warning(f"Could not extract additional data from token: {e}")
-                    # Fall back to standard expiration calculation
-                    expires_in = token_data.get("expires_in", 86400)
-                    self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self._update_token_metadata(token_data)
                 
                 logger.info("Successfully obtained access token")
                 logger.info(f"Location ID: {self.location_id}")
@@ -629,13 +1154,41 @@ class GoHighLevelOAuth:
             logger.error(f"Error exchanging code for token: {str(e)}")
             return None
     
+    @property
+    def token_expires_at(self):
+        """When the access token expires (naive local datetime, or None if unknown)"""
+        return self._token_expires_at
+    
+    @token_expires_at.setter
+    def token_expires_at(self, expires_at):
+        self._token_expires_at = expires_at
+        # Precompute the refresh deadline on the monotonic clock so checks are a float compare
+        if expires_at is None:
+            self._refresh_after = None
+        else:
+            seconds_left = (expires_at - TOKEN_REFRESH_MARGIN - datetime.now()).total_seconds()
+            self._refresh_after = time.monotonic() + seconds_left
+    
+    def token_needs_refresh(self):
+        """Return True if the access token expires within TOKEN_REFRESH_MARGIN"""
+        return self._refresh_after is not None and time.monotonic() >= self._refresh_after
+    
     def refresh_access_token(self):
-        """Refresh the access token using refresh token"""
+        """Refresh the access token using refresh token (only one refresh runs at a time)"""
+        with self._refresh_lock:
+            # Another thread may have refreshed while we were waiting for the lock
+            if self.access_token and self.token_expires_at and not self.token_needs_refresh():
+                logger.info("Access token was already refreshed by another caller")
+                return True
+            return self._refresh_access_token()
+    
+    def _refresh_access_token(self):
+        """Perform the refresh-token grant; callers must hold _refresh_lock"""
         if not self.refresh_token:
             logger.error("No refresh token available")
             return False
             
-        token_url = "https://services.leadconnectorhq.com/oauth/token"
+        token_url = GHL_TOKEN_URL
         
         data = {
             "client_id": self.client_id,
@@ -647,7 +1200,7 @@ class GoHighLevelOAuth:
         
         try:
             # Make request without headers as in get_token.py
-            response = requests.post(token_url, data=data)
+            response = self.session.post(token_url, data=data, timeout=GHL_REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -657,33 +1210,7 @@ class GoHighLevelOAuth:
                 if token_data.get("refresh_token"):
                     self.refresh_token = token_data.get("refresh_token")
                 
-                # Try to extract additional information from token if possible
-                try:
-                    # Import jwt only when needed
-                    decoded_token = jwt.decode(self.access_token, options={"verify_signature": False})
-                    
-                    # Extract location ID if not already available
-                    if not self.location_id and 'authClassId' in decoded_token:
-                        self.location_id = decoded_token['authClassId']
-                        logger.info(f"Extracted location_id from token: {self.location_id}")
-                    
-                    # Extract company ID if available in token
-                    if not self.company_id and 'companyId' in decoded_token:
-                        self.company_id = decoded_token['companyId']
-                        logger.info(f"Extracted company_id from token: {self.company_id}")
-                    
-                    # Calculate token expiration time from token if available
-                    if 'exp' in decoded_token:
-                        self.token_expires_at = datetime.fromtimestamp(decoded_token['exp'])
-                    else:
-                        # Default to 24 hours if not in token
-                        expires_in = token_data.get("expires_in", 86400)
-                        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
-                except Exception as e:
-                    logger.warning(f"Could not extract additional data from token: {e}")
-                    # Fall back to standard expiration calculation
-                    expires_in = token_data.get("expires_in", 86400)
-                    self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self._update_token_metadata(token_data)
                 
                 logger.info("Successfully refreshed access token")
                 logger.info(f"Token will expire at: {self.token_expires_at}")
@@ -705,14 +1232,18 @@ class GoHighLevelOAuth:
             return False
             
         # Check if token is about to expire (refresh 5 minutes before expiration)
-        if self.token_expires_at and datetime.now() >= (self.token_expires_at - timedelta(minutes=5)):
+        if self.token_needs_refresh():
             logger.info("Access token is about to expire, refreshing...")
             return self.refresh_access_token()
             
         return True
     
     def get_headers(self):
-        """Get headers for API requests"""
+        """Get headers for API requests (cached until the access token changes or nears expiry)"""
+        if (self._headers_cache is not None and self._headers_cache_token == self.access_token
+                and not self.token_needs_refresh()):
+            return self._headers_cache
+        
         if not self.ensure_valid_token():
             raise Exception("Unable to obtain valid access token")
             
@@ -722,23 +1253,96 @@ class GoHighLevelOAuth:
             "Version": "2021-04-15"
         }
         
+        self._headers_cache = headers
+        self._headers_cache_token = self.access_token
         return headers
     
-    def make_api_request(self, method, endpoint, data=None, params=None):
-        """Make an authenticated API request"""
+    def _wait_if_throttled(self):
+        """Block until another request fits in the GHL rate-limit window"""
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            if self._rate_limited_until > now:
+                time.sleep(self._rate_limited_until - now)
+                now = time.monotonic()
+            
+            while self._request_times and now - self._request_times[0] >= GHL_RATE_LIMIT_WINDOW:
+                self._request_times.popleft()
+            if len(self._request_times) >= GHL_RATE_LIMIT_REQUESTS:
+                time.sleep(GHL_RATE_LIMIT_WINDOW - (now - self._request_times[0]))
+                now = time.monotonic()
+            
+            self._request_times.append(now)
+    
+    def _track_rate_limit_headers(self, response):
+        """Pause upcoming requests when GHL reports the quota is nearly used up"""
+        try:
+            remaining = int(response.headers["X-RateLimit-Remaining"])
+            limit = int(response.headers["X-RateLimit-Max"])
+        except (KeyError, ValueError):
+            return
+        
+        if remaining < limit * GHL_RATE_LIMIT_LOW_WATERMARK:
+            try:
+                interval = int(response.headers["X-RateLimit-Interval-Milliseconds"]) / 1000
+            except (KeyError, ValueError):
+                interval = GHL_RATE_LIMIT_WINDOW
+            logger.warning(f"GHL rate limit nearly exhausted ({remaining}/{limit} left), pausing for {interval}s")
+            with self._rate_limit_lock:
+                self._rate_limited_until = max(self._rate_limited_until, time.monotonic() + interval)
+    
+    def make_api_request(self, method, endpoint, data=None, params=None, api_version=None,
+                         add_location_id=True, return_response=False, extra_headers=None):
+        """
+        Make an authenticated API request
+        
+        Args:
+            method: HTTP method
+            endpoint: API path, e.g. "/calendars/"
+            data: Optional JSON body
+            params: Optional query parameters
+            api_version: Optional "Version" header override for endpoints on a newer API version
+            add_location_id: Whether to add the current locationId to the query parameters
+            return_response: Return the raw response (whatever its status) instead of the parsed JSON
+            extra_headers: Optional headers added to this request only (e.g. an Idempotency-Key)
+            
+        Returns:
+            Parsed JSON on 200/201 (None otherwise), or the response object if return_response is set
+        """
         url = f"{self.api_base_url}{endpoint}"
         headers = self.get_headers()
+        if api_version:
+            headers = {**headers, "Version": api_version}
+        if extra_headers:
+            headers = {**headers, **extra_headers}
         
         # Add location ID to params if not already present and we have one
-        if self.location_id and params is None:
-            params = {}
-        if self.location_id and "locationId" not in str(params):
+        if add_location_id and self.location_id:
             if params is None:
-                params = {}
-            params["locationId"] = self.location_id
-        
-        response = requests.request(method, url, headers=headers, json=data, params=params)
-        
+                params = {"locationId": self.location_id}
+            elif "locationId" not in params:
+                params["locationId"] = self.location_id
+        
+        self._wait_if_throttled()
+        response = self.session.request(method, url, headers=headers, json=data, params=params,
+                                        timeout=GHL_REQUEST_TIMEOUT)
+        self._track_rate_limit_headers(response)
+        
+        if response.status_code == 429:
+            # A throttled request was not processed, so it is safe to send it once more.
+            # Only one retry per route is in flight at a time; other routes are unaffected. Locks
+            # are keyed by method and route template so IDs in the path don't add one per resource.
+            route = f"{method} {API_PATH_ID_RE.sub('/{id}', endpoint)}"
+            with self._endpoint_locks.setdefault(route, threading.Lock()):
+                retry_after = _retry_after_seconds(response)
+                logger.warning(f"GHL rate limit hit on {method} {endpoint}, retrying in {retry_after}s")
+                time.sleep(retry_after)
+                self._wait_if_throttled()
+                response = self.session.request(method, url, headers=headers, json=data, params=params,
+                                                timeout=GHL_REQUEST_TIMEOUT)
+                self._track_rate_limit_headers(response)
+        
+        if return_response:
+            return response
         if response.status_code in [200, 201]:
             return response.json()
         else:
@@ -773,24 +1377,13 @@ class GoHighLevelOAuth:
         if not first_name:
             first_name = "Client"
         
-        logger.info(f"Creating user with name: {first_name} {last_name}")
+        logger.info("Creating user with name: %s %s", first_name, last_name)
         
         # Get phone number from client data - ensure it's in E.164 format
         phone = client_data.get('phone', '')
         if phone:
-            # Remove any non-digit characters except the leading +
-            if phone.startswith('+'):
-                phone = '+' + ''.join(c for c in phone[1:] if c.isdigit())
-            else:
-                phone = '+1' + ''.join(c for c in phone if c.isdigit())
-            
-            # Ensure it starts with +1 for US numbers
-            if not phone.startswith('+'):
-                phone = '+' + phone
-            if not phone.startswith('+1') and len(phone) == 11:  # If it's a 10-digit number without country code
-                phone = '+1' + phone
-                
-            logger.info(f"Formatted phone number: {phone}")
+            phone = normalize_phone_number(phone)
+            logger.info("Formatted phone number: %s", phone)
         
         # Build user data for ACCOUNT-USER creation (v2 API)
         user_data = {
@@ -847,23 +1440,17 @@ class GoHighLevelOAuth:
         # Use v2 API user creation endpoint
         endpoint = "/users/"
         
-        logger.info(f"Creating ACCOUNT-USER: {first_name} {last_name} ({client_data.get('email')})")
+        logger.info("Creating ACCOUNT-USER: %s %s (%s)", first_name, last_name, client_data.get('email'))
         
         try:
-            # Override headers for user creation API
-            url = f"{self.api_base_url}{endpoint}"
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-                "Version": "2021-07-28"  # Specific version for user creation
-            }
-            
-            response = requests.post(url, headers=headers, json=user_data)
+            # User creation uses a newer API version and takes the location from the body
+            response = self.make_api_request("POST", endpoint, data=user_data, api_version=GHL_USERS_API_VERSION,
+                                             add_location_id=False, return_response=True)
             
             if response.status_code in [200, 201]:
                 response_data = response.json()
             elif response.status_code == 400 and "already exists" in response.text:
-                logger.info(f"User already exists with this email - skipping user creation")
+                logger.info("User already exists with this email - skipping user creation")
                 # Return a mock response for existing user
                 response_data = {
                     "id": "existing_user",
@@ -871,25 +1458,25 @@ class GoHighLevelOAuth:
                     "message": "User already exists"
                 }
             else:
-                logger.error(f"User creation API failed: {response.status_code} - {response.text}")
+                logger.error("User creation API failed: %s - %s", response.status_code, response.text)
                 response_data = None
             
             if response_data:
                 user_id = response_data.get('id')
-                logger.info(f"✅ ACCOUNT-USER created successfully: {user_id}")
+                logger.info("✅ ACCOUNT-USER created successfully: %s", user_id)
                 
                 # Log important info
                 generated_password = response_data.get('password')
                 if generated_password:
-                    logger.info(f"🔑 Auto-generated password: {generated_password}")
+                    logger.info("🔑 Auto-generated password: %s", generated_password)
                 
                 return response_data
             else:
-                logger.error(f"❌ Failed to create ACCOUNT-USER")
+                logger.error("❌ Failed to create ACCOUNT-USER")
                 return None
                 
         except Exception as e:
-            logger.error(f"❌ Error creating ACCOUNT-USER: {e}")
+            logger.error("❌ Error creating ACCOUNT-USER: %s", e)
             return None
     
     def create_calendar(self, calendar_data):
@@ -973,15 +1560,16 @@ class GoHighLevelOAuth:
         if end_date:
             params["endAt"] = end_date.strftime("%Y-%m-%d")
             
-        response = self.make_api_request("GET", endpoint, params=params)
+        # locationId is already in params, so make_api_request doesn't need to add it
+        response = self.make_api_request("GET", endpoint, params=params, add_location_id=False)
         
         if response:
             # API returns different structure according to docs
             submissions = response.get("submissions", [])
             meta = response.get("meta", {})
             
-            logger.info(f"Retrieved {len(submissions)} form submissions (page {page})")
-            logger.info(f"Total submissions: {meta.get('total', 'unknown')}")
+            logger.info("Retrieved %s form submissions (page %s)", len(submissions), page)
+            logger.info("Total submissions: %s", meta.get('total', 'unknown'))
             
             return {
                 "submissions": submissions,
@@ -994,12 +1582,59 @@ class GoHighLevelOAuth:
                 }
             }
         else:
-            logger.error(f"Failed to retrieve form submissions")
+            logger.error("Failed to retrieve form submissions")
             return None
             
+    def get_all_form_submissions(self, form_id, start_date=None, end_date=None, max_workers=8):
+        """
+        Get every submission of a form, fetching pages 2..N concurrently once the total is known
+        
+        Args:
+            form_id: The ID of the form to retrieve submissions from
+            start_date: Optional start date for filtering submissions (datetime object)
+            end_date: Optional end date for filtering submissions (datetime object)
+            max_workers: Maximum number of pages fetched at the same time
+            
+        Returns:
+            List of submissions in page order, or None if any page could not be fetched
+        """
+        first_page = self.get_form_submissions(form_id, start_date, end_date, limit=FORM_SUBMISSIONS_PAGE_SIZE, page=1)
+        if not first_page:
+            return None
+        
+        submissions = list(first_page["submissions"])
+        total = first_page["pagination"].get("total") or 0
+        page_count = -(-int(total) // FORM_SUBMISSIONS_PAGE_SIZE)
+        if page_count <= 1:
+            return submissions
+        
+        def fetch(page_number):
+            return self.get_form_submissions(form_id, start_date, end_date,
+                                             limit=FORM_SUBMISSIONS_PAGE_SIZE, page=page_number)
+        
+        remaining_pages = range(2, page_count + 1)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(remaining_pages))) as executor:
+            pages = dict(zip(remaining_pages, executor.map(fetch, remaining_pages)))
+        
+        # A missing page would silently drop its clients from onboarding, so retry each
+        # failed page once and give up on the whole listing if it still fails
+        for page_number in remaining_pages:
+            if not pages[page_number]:
+                logger.warning("Retrying form submissions page %s after a failed request", page_number)
+                pages[page_number] = fetch(page_number)
+                if not pages[page_number]:
+                    logger.error("Form submissions page %s failed twice, not returning a partial list", page_number)
+                    return None
+            submissions.extend(pages[page_number]["submissions"])
+        
+        logger.info("Retrieved %s of %s form submissions across %s pages", len(submissions), total, page_count)
+        return submissions
+    
     def get_form_fields(self, form_id):
         """
         Get field definitions for a specific form
+        Cached per form: fresh for FORM_FIELDS_TTL, then served stale while a background
+        refresh runs, up to FORM_FIELDS_MAX_STALE
         
         Args:
             form_id: The ID of the form
@@ -1007,20 +1642,39 @@ class GoHighLevelOAuth:
         Returns:
             List of form fields or None if failed
         """
+        cached = self._form_fields_cache.get(form_id)
+        if cached:
+            age = time.time() - cached[0]
+            if age < FORM_FIELDS_TTL:
+                return cached[1]
+            if age < FORM_FIELDS_MAX_STALE:
+                if form_id not in self._form_fields_refreshing:
+                    self._form_fields_refreshing.add(form_id)
+                    threading.Thread(target=self._fetch_form_fields, args=(form_id,), daemon=True).start()
+                return cached[1]
+        
+        return self._fetch_form_fields(form_id)
+    
+    def _fetch_form_fields(self, form_id):
+        """Fetch field definitions for a form from the API and cache them"""
         endpoint = f"/forms/{form_id}"
         
-        response = self.make_api_request("GET", endpoint)
+        try:
+            response = self.make_api_request("GET", endpoint)
+        finally:
+            self._form_fields_refreshing.discard(form_id)
         
         if response:
             form_data = response
             fields = form_data.get("form", {}).get("fields", [])
+            self._form_fields_cache[form_id] = (time.time(), fields)
             logger.info(f"Retrieved {len(fields)} form fields")
             return fields
         else:
             logger.error(f"Failed to retrieve form fields")
             return None
 
-    def save_tokens(self, filename="tokens.json"):
+    def save_tokens(self, filename=TOKEN_FILE):
         """Save tokens to a file for persistence"""
         token_data = {
             "access_token": self.access_token,
@@ -1030,15 +1684,23 @@ class GoHighLevelOAuth:
             "token_expires_at": self.token_expires_at.isoformat() if self.token_expires_at else None
         }
         
-        with open(filename, "w") as f:
-            json.dump(token_data, f, indent=2)
+        # Write to a temp file in the same directory and swap it in, so readers
+        # (including get_token.py) never see a half-written tokens file
+        fd, tmp_path = tempfile.mkstemp(prefix=".tokens-", suffix=".tmp", dir=os.path.dirname(os.path.abspath(filename)))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(token_data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, filename)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         logger.info(f"Tokens saved to {filename}")
     
-    def load_tokens(self, filename="tokens.json"):
+    def load_tokens(self, filename=TOKEN_FILE):
         """Load tokens from a file"""
         try:
-            with open(filename, "r") as f:
-                token_data = json.load(f)
+            with open(filename, "rb") as f:
+                token_data = orjson.loads(f.read())
             
             self.access_token = token_data.get("access_token")
             self.refresh_token = token_data.get("refresh_token")
@@ -1150,6 +1812,93 @@ def create_user_and_calendar(oauth_client, client_data, calendar_data):
     logger.info(f"Successfully created user {user_id} and calendar {calendar_id}")
     return (user_id, calendar_id)
 
+# Client Onboarding form field IDs -> field names
+FIELD_ID_MAPPING = {
+    "i0IQ8WjvM7HfaHVk21MH": "business_time_zone",
+    "a24WJXsCB54SwoIxN0Rx": "zip_codes_for_targeting",
+    "XdGavN9kI5tWJ6KgCusY": "working_hours",
+    "JPZRWM9OisPRkElvYzaO": "appointments_per_day",
+    "eAWIt4LmTOHFtmmhF76S": "appointments_purchased",
+    "COQHzHOTfLRVTjWdHj2I": "years_in_business",
+    "RxBJOSfz1BgEKWw9Elrm": "role",
+    "2r2w8iKtE7P6YTQPk55U": "sales_for_2024",
+    "moTUEvoc35yRH2SlEuRo": "challenges_faced",
+    "1msoKMpJKOiX3mgh812t": "what_brought_you_to_us"
+}
+FIELD_ID_KEYS = frozenset(FIELD_ID_MAPPING)
+
+# Direct field mappings from "others" (earlier names take precedence)
+CLIENT_FIELD_MAPPINGS = {
+    "phone": ["phone", "phoneNumber", "phone_number", "mobile"],
+    "companyName": ["business_name", "company_name", "client_business_name", "company", "companyName", "businessName", "first_name"],
+    "name": ["client_name", "full_name", "poc_name_1", "name"]  # full_name is client name
+}
+
+# Address field mappings from "others" (country is always USA)
+ADDRESS_FIELD_MAPPINGS = {
+    "line1": ["address", "business_address", "streetAddress", "address1", "street"],
+    "city": ["city"],
+    "state": ["state", "province"],
+    "postalCode": ["postal_code", "zip", "zipCode", "postalCode"]
+}
+
+# Inverse indexes: form field name -> (client field, precedence)
+CLIENT_FIELD_ALIASES = {
+    alias: (client_field, rank)
+    for client_field, aliases in CLIENT_FIELD_MAPPINGS.items()
+    for rank, alias in enumerate(aliases)
+}
+ADDRESS_FIELD_ALIASES = {
+    alias: (address_field, rank)
+    for address_field, aliases in ADDRESS_FIELD_MAPPINGS.items()
+    for rank, alias in enumerate(aliases)
+}
+
+# Working hours option IDs -> day names
+WORKING_HOURS_DAY_MAPPING = {
+    "6b65bf74-32ff-4342-9629-bba68679ff00": "monday",
+    "5783a7ba-cf90-4826-bf82-68aa83335488": "tuesday",
+    "94126b3a-ec45-4947-a2aa-a1deeec68d62": "wednesday",
+    "option-1750956538898": "thursday",
+    "option-1750956603512": "friday",
+    "option-1750956604386": "saturday",
+    "option-1750956605407": "sunday"
+}
+
+# Business fields stored as CRM custom fields
+CUSTOM_FIELD_MAPPINGS = {
+    "business_time_zone": "contact.business_time_zone",
+    "zip_codes_for_targeting": "contact.zip_codes_for_targeting_locations",
+    "appointments_per_day": "contact.appointments_per_day",
+    "appointments_purchased": "contact.appointments_purchased",
+    "years_in_business": "contact.years_in_business",
+    "sales_for_2024": "contact.sales_for_2024",
+    "challenges_faced": "contact.challenges_faced",
+    "what_brought_you_to_us": "contact.what_brought_you_to_us",
+    "role": "contact.role"
+}
+
+def _match_field_aliases(others, aliases):
+    """
+    Find which submitted field fills each target field in a single pass over the submission
+    
+    Args:
+        others: Submitted form fields
+        aliases: Inverse index of form field name -> (target field, precedence)
+        
+    Returns:
+        Dict of target field -> name of the highest-precedence non-empty form field
+    """
+    matches = {}
+    for field_name, value in others.items():
+        entry = aliases.get(field_name)
+        if entry is None or not value:
+            continue
+        target, rank = entry
+        if target not in matches or rank < matches[target][0]:
+            matches[target] = (rank, field_name)
+    return {target: field_name for target, (rank, field_name) in matches.items()}
+
 def process_form_submission(submission, fields_mapping=None):
     """
     Process a form submission and convert it to client data
@@ -1184,160 +1933,110 @@ def process_form_submission(submission, fields_mapping=None):
     if submission.get("name"):
         client_data["name"] = submission["name"]
         client_data["field_mappings_used"]["name"] = "direct"
-        logger.info(f"Direct name: {client_data['name']}")
+        logger.info("Direct name: %s", client_data['name'])
     
     if submission.get("email"):
         client_data["email"] = submission["email"]
         client_data["field_mappings_used"]["email"] = "direct"
-        logger.info(f"Direct email: {client_data['email']}")
+        logger.info("Direct email: %s", client_data['email'])
     
     # Extract fields from the "others" object
     others = submission.get("others", {})
     
-    # Field ID to Field Name Mapping
-    FIELD_ID_MAPPING = {
-        "i0IQ8WjvM7HfaHVk21MH": "business_time_zone",
-        "a24WJXsCB54SwoIxN0Rx": "zip_codes_for_targeting",
-        "XdGavN9kI5tWJ6KgCusY": "working_hours",
-        "JPZRWM9OisPRkElvYzaO": "appointments_per_day",
-        "eAWIt4LmTOHFtmmhF76S": "appointments_purchased",
-        "COQHzHOTfLRVTjWdHj2I": "years_in_business",
-        "RxBJOSfz1BgEKWw9Elrm": "role",
-        "2r2w8iKtE7P6YTQPk55U": "sales_for_2024",
-        "moTUEvoc35yRH2SlEuRo": "challenges_faced",
-        "1msoKMpJKOiX3mgh812t": "what_brought_you_to_us"
-    }
-    
     # Translate field IDs to field names for easier processing
     logger.info("Translating field IDs to field names...")
-    for field_id in list(others.keys()):
-        if field_id in FIELD_ID_MAPPING:
-            field_name = FIELD_ID_MAPPING[field_id]
-            field_value = others[field_id]
-            others[field_name] = field_value
-            client_data["field_mappings_used"][field_name] = field_id
-            logger.info(f"  {field_id} → {field_name}: {field_value}")
-    
-    # Direct field mappings from "others"
-    field_mappings = {
-        "phone": ["phone", "phoneNumber", "phone_number", "mobile"],
-        "companyName": ["business_name", "company_name", "client_business_name", "company", "companyName", "businessName", "first_name"],
-        "name": ["client_name", "full_name", "poc_name_1", "name"]  # full_name is client name
-    }
-    
-    # Address field mappings from "others"
-    address_mappings = {
-        "line1": ["address", "business_address", "streetAddress", "address1", "street"],
-        "city": ["city"],
-        "state": ["state", "province"], 
-        "postalCode": ["postal_code", "zip", "zipCode", "postalCode"]
-        # Country is already set to USA by default
-    }
+    for field_id in FIELD_ID_KEYS.intersection(others):
+        field_name = FIELD_ID_MAPPING[field_id]
+        field_value = others[field_id]
+        others[field_name] = field_value
+        client_data["field_mappings_used"][field_name] = field_id
+        logger.info("  %s → %s: %s", field_id, field_name, field_value)
     
     # Process standard fields
     logger.info("Mapping standard fields...")
-    for client_field, possible_names in field_mappings.items():
-        for field_name in possible_names:
-            if field_name in others and others[field_name]:
-                client_data[client_field] = others[field_name]
-                client_data["field_mappings_used"][client_field] = field_name
-                logger.info(f"  {client_field} ← {field_name}: {others[field_name]}")
-                break
+    for client_field, field_name in _match_field_aliases(others, CLIENT_FIELD_ALIASES).items():
+        client_data[client_field] = others[field_name]
+        client_data["field_mappings_used"][client_field] = field_name
+        logger.info("  %s ← %s: %s", client_field, field_name, others[field_name])
     
     # Ensure we have a company name - if not found, use a default
     if not client_data.get("companyName"):
         if client_data.get("name"):
             # Use the client name with "Business" appended if no company name is found
             client_data["companyName"] = f"{client_data['name']}'s Business"
-            logger.info(f"  No company name found, using client name: {client_data['companyName']}")
+            logger.info("  No company name found, using client name: %s", client_data['companyName'])
         else:
             client_data["companyName"] = "New Client Business"
-            logger.info(f"  No company or client name found, using default: {client_data['companyName']}")
+            logger.info("  No company or client name found, using default: %s", client_data['companyName'])
     
     # Ensure we have a client name - if not found, use company name
     if not client_data.get("name"):
         if client_data.get("companyName"):
             # Extract first part of company name as client name
             client_data["name"] = client_data["companyName"].split(" ")[0]
-            logger.info(f"  No client name found, using company name: {client_data['name']}")
+            logger.info("  No client name found, using company name: %s", client_data['name'])
         else:
             client_data["name"] = "Client"
-            logger.info(f"  No client or company name found, using default: {client_data['name']}")
+            logger.info("  No client or company name found, using default: %s", client_data['name'])
             
     # Log the field mappings used
-    logger.info("Field mappings used:")
-    for field, mapping in client_data["field_mappings_used"].items():
-        logger.info(f"  {field}: {mapping}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Field mappings used:")
+        for field, mapping in client_data["field_mappings_used"].items():
+            logger.info("  %s: %s", field, mapping)
     
     # Process address fields
     logger.info("Mapping address fields...")
-    for address_field, possible_names in address_mappings.items():
-        for field_name in possible_names:
-            if field_name in others and others[field_name]:
-                client_data["address"][address_field] = others[field_name]
-                client_data["field_mappings_used"][f"address.{address_field}"] = field_name
-                logger.info(f"  address.{address_field} ← {field_name}: {others[field_name]}")
-                break
+    for address_field, field_name in _match_field_aliases(others, ADDRESS_FIELD_ALIASES).items():
+        client_data["address"][address_field] = others[field_name]
+        client_data["field_mappings_used"][f"address.{address_field}"] = field_name
+        logger.info("  address.%s ← %s: %s", address_field, field_name, others[field_name])
     
     # Process working hours from complex structure
     if "working_hours" in others:
         working_hours_data = others["working_hours"]
         
-        # Working hours day mapping
-        WORKING_HOURS_DAY_MAPPING = {
-            "6b65bf74-32ff-4342-9629-bba68679ff00": "monday",
-            "5783a7ba-cf90-4826-bf82-68aa83335488": "tuesday",
-            "94126b3a-ec45-4947-a2aa-a1deeec68d62": "wednesday",
-            "option-1750956538898": "thursday",
-            "option-1750956603512": "friday",
-            "option-1750956604386": "saturday",
-            "option-1750956605407": "sunday"
-        }
-        
-        # Check if it's a string that needs to be parsed as JSON
+        # Check if it's a string that needs to be parsed (usually a Python dict repr, sometimes JSON)
         if isinstance(working_hours_data, str):
             try:
-                working_hours_data = json.loads(working_hours_data.replace("'", '"'))
-            except:
-                # If parsing fails, keep as string
-                pass
+                working_hours_data = ast.literal_eval(working_hours_data)
+            except Exception:
+                # literal_eval raises more than ValueError/SyntaxError on malformed input
+                # (TypeError, RecursionError, ...); none of them should drop the client
+                try:
+                    working_hours_data = orjson.loads(working_hours_data.replace("'", '"'))
+                except Exception:
+                    # If parsing fails, keep as string
+                    pass
         
         # If it's a dictionary, extract the hours
         if isinstance(working_hours_data, dict):
-            logger.info("Extracting working hours schedule:")
-            for day_id, day_name in WORKING_HOURS_DAY_MAPPING.items():
-                if day_id in working_hours_data and working_hours_data[day_id]:
-                    client_data["working_hours"][day_name] = working_hours_data[day_id]
-                    logger.info(f"  {day_name.capitalize()}: {working_hours_data[day_id]}")
-                    
-                    # Add as custom field for CRM
-                client_data["customFields"].append({
-                        "key": f"contact.working_hours_{day_name}",
-                        "field_value": str(working_hours_data[day_id])
-                })
+            client_data["working_hours"] = {
+                day_name: working_hours_data[day_id]
+                for day_id, day_name in WORKING_HOURS_DAY_MAPPING.items()
+                if working_hours_data.get(day_id)
+            }
+            # Add as custom fields for CRM (only for days that have hours)
+            client_data["customFields"].extend(
+                {"key": f"contact.working_hours_{day_name}", "field_value": str(hours)}
+                for day_name, hours in client_data["working_hours"].items()
+            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Extracting working hours schedule:")
+                for day_name, hours in client_data["working_hours"].items():
+                    logger.info("  %s: %s", day_name.capitalize(), hours)
     
     # Add important business fields as custom fields
-    custom_field_mappings = {
-        "business_time_zone": "contact.business_time_zone",
-        "zip_codes_for_targeting": "contact.zip_codes_for_targeting_locations",
-        "appointments_per_day": "contact.appointments_per_day",
-        "appointments_purchased": "contact.appointments_purchased",
-        "years_in_business": "contact.years_in_business",
-        "sales_for_2024": "contact.sales_for_2024",
-        "challenges_faced": "contact.challenges_faced",
-        "what_brought_you_to_us": "contact.what_brought_you_to_us",
-        "role": "contact.role"
-    }
-    
-    # Process custom fields
-    logger.info("Adding business fields as custom fields:")
-    for field_name, custom_key in custom_field_mappings.items():
-        if field_name in others and others[field_name]:
-            client_data["customFields"].append({
-                "key": custom_key,
-                "field_value": str(others[field_name])
-            })
-            logger.info(f"  {custom_key}: {others[field_name]}")
+    business_fields = [
+        {"key": custom_key, "field_value": str(others[field_name])}
+        for field_name, custom_key in CUSTOM_FIELD_MAPPINGS.items()
+        if others.get(field_name)
+    ]
+    client_data["customFields"].extend(business_fields)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Adding business fields as custom fields:")
+        for custom_field in business_fields:
+            logger.info("  %s: %s", custom_field["key"], custom_field["field_value"])
     
     # Store business information directly in client_data for easier access
     if "business_time_zone" in others:
@@ -1350,23 +2049,175 @@ def process_form_submission(submission, fields_mapping=None):
         client_data["appointments_purchased"] = others["appointments_purchased"]
     if "years_in_business" in others:
         client_data["years_in_business"] = others["years_in_business"]
+    if others.get("area_code"):
+        # Keep just the three digits if the answer has extra text
+        area_code_match = AREA_CODE_RE.search(str(others["area_code"]))
+        if area_code_match:
+            client_data["area_code"] = area_code_match.group(0)
     
     # Add business name as a tag if present
     if client_data["companyName"]:
         client_data["tags"].append(f"Business:{client_data['companyName']}")
                 
     # Log the final client data for verification
-    logger.info("\nFINAL CLIENT DATA:")
-    logger.info(f"Name: {client_data.get('name', 'Not set')}")
-    logger.info(f"Email: {client_data.get('email', 'Not set')}")
-    logger.info(f"Phone: {client_data.get('phone', 'Not set')}")
-    logger.info(f"Company Name: {client_data.get('companyName', 'Not set')}")
-    logger.info(f"Address: {client_data.get('address', {})}")
-    logger.info(f"Timezone: {client_data.get('timezone', 'Not set')}")
-    logger.info(f"ZIP Codes for Targeting: {client_data.get('zip_codes_for_targeting', 'Not set')}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\nFINAL CLIENT DATA:")
+        logger.info("Name: %s", client_data.get('name', 'Not set'))
+        logger.info("Email: %s", client_data.get('email', 'Not set'))
+        logger.info("Phone: %s", client_data.get('phone', 'Not set'))
+        logger.info("Company Name: %s", client_data.get('companyName', 'Not set'))
+        logger.info("Address: %s", client_data.get('address', {}))
+        logger.info("Timezone: %s", client_data.get('timezone', 'Not set'))
+        logger.info("ZIP Codes for Targeting: %s", client_data.get('zip_codes_for_targeting', 'Not set'))
                 
     return client_data
 
+# Common timezone names/abbreviations mapped to IANA identifiers, matched by
+# substring. Longest keys come first so e.g. "eastern" wins over "est"/"et".
+TIMEZONE_MAPPING = tuple(sorted((
+    ("eastern", "America/New_York"),
+    ("central", "America/Chicago"),
+    ("mountain", "America/Denver"),
+    ("pacific", "America/Los_Angeles"),
+    ("est", "America/New_York"),
+    ("edt", "America/New_York"),
+    ("cst", "America/Chicago"),
+    ("cdt", "America/Chicago"),
+    ("mst", "America/Denver"),
+    ("mdt", "America/Denver"),
+    ("pst", "America/Los_Angeles"),
+    ("pdt", "America/Los_Angeles"),
+    ("et", "America/New_York"),
+    ("ct", "America/Chicago"),
+    ("mt", "America/Denver"),
+    ("pt", "America/Los_Angeles"),
+), key=lambda item: -len(item[0])))
+
+@lru_cache(maxsize=64)
+def resolve_timezone(value):
+    """
+    Map a free-form timezone answer (e.g. "Central", "PST") to an IANA identifier
+    
+    Args:
+        value (str): Timezone name or abbreviation as entered by the client
+    
+    Returns:
+        str: IANA timezone identifier, or None if not recognized
+    """
+    value_lower = value.lower() if value else ""
+    for key, tz in TIMEZONE_MAPPING:
+        if key in value_lower:
+            return tz
+    return None
+
+@lru_cache(maxsize=32)
+def _get_tz(name):
+    """
+    Resolve an IANA timezone name, caching the pytz zone object
+    
+    Args:
+        name (str): IANA timezone identifier
+    
+    Returns:
+        pytz timezone for the name
+    """
+    return pytz.timezone(name)
+
+EST_TZ = _get_tz("America/New_York")
+
+@lru_cache(maxsize=64)
+def _tz_delta_minutes(source_tz_name, date_ordinal):
+    """
+    Minutes to add to a wall-clock time in the source timezone to get EST/EDT
+    
+    Args:
+        source_tz_name (str): IANA timezone identifier of the source
+        date_ordinal (int): Proleptic Gregorian ordinal of the day to convert on
+    
+    Returns:
+        int: Offset difference in minutes (EST/EDT minus source)
+    """
+    day = datetime.fromordinal(date_ordinal)
+    delta = EST_TZ.utcoffset(day) - _get_tz(source_tz_name).utcoffset(day)
+    return int(delta.total_seconds() // 60)
+
+def to_24_hour(hour, is_am, is_pm):
+    """
+    Convert a 12-hour clock hour to 24-hour form when AM/PM is known
+    
+    Args:
+        hour (int): Hour as written (0-23)
+        is_am (bool): Whether the time was marked AM
+        is_pm (bool): Whether the time was marked PM
+    
+    Returns:
+        int: Hour in 24-hour form (unchanged when neither AM nor PM is set)
+    """
+    if is_pm and hour < 12:
+        return hour + 12
+    if is_am and hour == 12:
+        return 0
+    return hour
+
+def infer_hour_range(start_hour, end_hour, start_is_am, start_is_pm, end_is_am, end_is_pm):
+    """
+    Apply business-hours heuristics to a 24-hour start/end pair whose AM/PM may be missing
+    
+    Args:
+        start_hour (int): Start hour, already converted with to_24_hour
+        end_hour (int): End hour, already converted with to_24_hour
+        start_is_am (bool): Whether the start time was marked AM
+        start_is_pm (bool): Whether the start time was marked PM
+        end_is_am (bool): Whether the end time was marked AM
+        end_is_pm (bool): Whether the end time was marked PM
+    
+    Returns:
+        tuple: (start_hour, end_hour)
+    """
+    # Handle cases where AM/PM is not specified
+    if not (start_is_am or start_is_pm) and not (end_is_am or end_is_pm):
+        # If both times have no AM/PM indicator
+        
+        # Case 1: Both times are in the same half of the day
+        if (start_hour < 12 and end_hour < 12) or (start_hour >= 12 and end_hour >= 12):
+            # If end time is less than start time, assume end time is PM if both are AM
+            if end_hour < start_hour and start_hour < 12:
+                end_hour += 12
+        
+        # Case 2: Likely crossing from AM to PM
+        elif start_hour < 12 and end_hour >= 12:
+            # This is already correct (e.g., 10 to 14)
+            pass
+        
+        # Case 3: Likely crossing from PM to AM (overnight)
+        elif start_hour >= 12 and end_hour < 12:
+            # This is unusual but possible (e.g., 22 to 2)
+            # We'll assume this is not overnight and end time is PM
+            end_hour += 12
+        
+        # Special case: Both times are small numbers
+        if start_hour < 7 and end_hour < 7:
+            # Assume business hours (e.g., 5 to 6 likely means 5PM to 6PM)
+            start_hour += 12
+            end_hour += 12
+    
+    # Special case: If end hour is still less than start hour, it might be overnight
+    # But in business context, it's more likely both are PM or both are AM
+    if end_hour < start_hour:
+        # If end hour is very small (1-6) and start hour is larger, assume end is PM
+        if end_hour < 7 and not end_is_am:
+            end_hour += 12
+    
+    return start_hour, end_hour
+
+# Custom field keys read by extract_calendar_settings_from_client_data
+CALENDAR_FIELD_KEYS = frozenset((
+    "contact.business_time_zone",
+    "contact.time_zone",
+    "contact.which_days_of_the_week_do_you_work_on_appointments",
+    "contact.what_is_the_earliest_and_latest_time_you_can_run_appointments",
+))
+
 def extract_calendar_settings_from_client_data(client_data):
     """
     Extract calendar settings from client data custom fields
@@ -1391,155 +2242,70 @@ def extract_calendar_settings_from_client_data(client_data):
         "bufferAfter": 15
     }
     
-    # Extract timezone from custom fields - first check for business_time_zone specifically
-    business_timezone = None
-    time_zone_field = None
-    
-    # First pass - look specifically for business_time_zone
+    # Collect the calendar-related custom fields in a single pass (first occurrence wins)
+    calendar_fields = {}
     for custom_field in client_data.get("customFields", []):
-        if custom_field.get("key") == "contact.business_time_zone":
-            business_timezone = custom_field.get("field_value", "")
-            break
-        elif custom_field.get("key") == "contact.time_zone" and not time_zone_field:
-            time_zone_field = custom_field
+        key = custom_field.get("key")
+        if key in CALENDAR_FIELD_KEYS and key not in calendar_fields:
+            calendar_fields[key] = custom_field.get("field_value", "")
     
-    # If business_time_zone not found, fall back to time_zone
-    if not business_timezone and time_zone_field:
-        business_timezone = time_zone_field.get("field_value", "")
+    # Prefer business_time_zone, fall back to time_zone
+    business_timezone = calendar_fields.get("contact.business_time_zone") or calendar_fields.get("contact.time_zone")
     
     # Process timezone value if found
     if business_timezone:
         # Map common timezone names to proper timezone identifiers
-        timezone_mapping = {
-            "eastern": "America/New_York",
-            "central": "America/Chicago", 
-            "mountain": "America/Denver",
-            "pacific": "America/Los_Angeles",
-            "est": "America/New_York",
-            "edt": "America/New_York",
-            "cst": "America/Chicago",
-            "cdt": "America/Chicago",
-            "mst": "America/Denver", 
-            "mdt": "America/Denver",
-            "pst": "America/Los_Angeles",
-            "pdt": "America/Los_Angeles",
-            "et": "America/New_York",
-            "ct": "America/Chicago",
-            "mt": "America/Denver",
-            "pt": "America/Los_Angeles"
-        }
-        
-        timezone_lower = business_timezone.lower()
-        for key, tz in timezone_mapping.items():
-            if key in timezone_lower:
-                settings["timezone"] = tz
-                logger.info(f"Setting calendar timezone to {tz} based on business time zone: {business_timezone}")
-                break
+        tz = resolve_timezone(business_timezone)
+        if tz:
+            settings["timezone"] = tz
+            logger.info("Setting calendar timezone to %s based on business time zone: %s", tz, business_timezone)
     
-    # Rest of the function remains the same
     # Extract working days
-    for custom_field in client_data.get("customFields", []):
-        if custom_field.get("key") == "contact.which_days_of_the_week_do_you_work_on_appointments":
-            working_days_value = custom_field.get("field_value", "").lower()
-            if working_days_value:
-                # Reset availability to empty
-                settings["availability"] = {}
-                
-                # Check for each day
-                days_mapping = {
-                    "monday": "monday",
-                    "tuesday": "tuesday", 
-                    "wednesday": "wednesday",
-                    "thursday": "thursday",
-                    "friday": "friday",
-                    "saturday": "saturday",
-                    "sunday": "sunday"
-                }
-                
-                for day_name, day_key in days_mapping.items():
-                    if day_name in working_days_value:
-                        settings["availability"][day_key] = [{"start": "09:00", "end": "17:00"}]
-        
-        # Extract working hours
-        elif custom_field.get("key") == "contact.what_is_the_earliest_and_latest_time_you_can_run_appointments":
-            hours_value = custom_field.get("field_value", "")
-            if hours_value:
-                # Try to parse time ranges like "9am-5pm", "09:00-17:00", "12 to 2", "12:30 to 3:50"
-                import re
-                
-                # Find any time range pattern in the string
-                # This regex matches various formats with or without AM/PM indicators
-                time_pattern = r'(\d{1,2})(?::(\d{1,2}))?\s*(am|pm)?\s*(?:[-to]+)\s*(\d{1,2})(?::(\d{1,2}))?\s*(am|pm)?'
-                match = re.search(time_pattern, hours_value.lower())
-                
-                if match:
-                    start_hour_str, start_min_str, start_ampm, end_hour_str, end_min_str, end_ampm = match.groups()
-                    
-                    # Parse hours and minutes
-                    start_hour = int(start_hour_str)
-                    end_hour = int(end_hour_str)
-                    start_min = int(start_min_str) if start_min_str else 0
-                    end_min = int(end_min_str) if end_min_str else 0
-                    
-                    # Track if AM/PM was explicitly specified
-                    start_is_am = start_ampm == 'am'
-                    start_is_pm = start_ampm == 'pm'
-                    end_is_am = end_ampm == 'am'
-                    end_is_pm = end_ampm == 'pm'
-                    
-                    # Convert to 24-hour format if AM/PM is specified
-                    if start_is_pm and start_hour < 12:
-                        start_hour += 12
-                    elif start_is_am and start_hour == 12:
-                        start_hour = 0
-                        
-                    if end_is_pm and end_hour < 12:
-                        end_hour += 12
-                    elif end_is_am and end_hour == 12:
-                        end_hour = 0
-                    
-                    # Handle cases where AM/PM is not specified
-                    if not (start_is_am or start_is_pm) and not (end_is_am or end_is_pm):
-                        # If both times have no AM/PM indicator
-                        
-                        # Case 1: Both times are in the same half of the day
-                        if (start_hour < 12 and end_hour < 12) or (start_hour >= 12 and end_hour >= 12):
-                            # If end time is less than start time, assume end time is PM if both are AM
-                            if end_hour < start_hour and start_hour < 12:
-                                end_hour += 12
-                        
-                        # Case 2: Likely crossing from AM to PM
-                        elif start_hour < 12 and end_hour >= 12:
-                            # This is already correct (e.g., 10 to 14)
-                            pass
-                        
-                        # Case 3: Likely crossing from PM to AM (overnight)
-                        elif start_hour >= 12 and end_hour < 12:
-                            # This is unusual but possible (e.g., 22 to 2)
-                            # We'll assume this is not overnight and end time is PM
-                            end_hour += 12
-                        
-                        # Special case: Both times are small numbers
-                        if start_hour < 7 and end_hour < 7:
-                            # Assume business hours (e.g., 5 to 6 likely means 5PM to 6PM)
-                            start_hour += 12
-                            end_hour += 12
-                    
-                    # Special case: If end hour is still less than start hour, it might be overnight
-                    # But in business context, it's more likely both are PM or both are AM
-                    if end_hour < start_hour:
-                        # If end hour is very small (1-6) and start hour is larger, assume end is PM
-                        if end_hour < 7 and not end_is_am:
-                            end_hour += 12
-                    
-                    start_time = f"{start_hour:02d}:{start_min:02d}"
-                    end_time = f"{end_hour:02d}:{end_min:02d}"
-                    
-                    logger.info(f"Parsed working hours: {start_time} to {end_time}")
-                    
-                    # Update all working days with these hours
-                    for day in settings["availability"]:
-                        settings["availability"][day] = [{"start": start_time, "end": end_time}]
+    working_days_value = calendar_fields.get("contact.which_days_of_the_week_do_you_work_on_appointments", "").lower()
+    if working_days_value:
+        # Reset availability to empty
+        settings["availability"] = {}
+        
+        # Check for each day
+        for day_key in DAY_NAME_RE.findall(working_days_value):
+            settings["availability"][day_key] = [{"start": "09:00", "end": "17:00"}]
+    
+    # Extract working hours
+    hours_value = calendar_fields.get("contact.what_is_the_earliest_and_latest_time_you_can_run_appointments", "")
+    if hours_value:
+        # Try to parse time ranges like "9am-5pm", "09:00-17:00", "12 to 2", "12:30 to 3:50"
+        match = TIME_RANGE_RE.search(hours_value.lower())
+        
+        if match:
+            start_hour_str, start_min_str, start_ampm, end_hour_str, end_min_str, end_ampm = match.groups()
+            
+            # Parse hours and minutes
+            start_hour = int(start_hour_str)
+            end_hour = int(end_hour_str)
+            start_min = int(start_min_str) if start_min_str else 0
+            end_min = int(end_min_str) if end_min_str else 0
+            
+            # Track if AM/PM was explicitly specified
+            start_is_am = start_ampm == 'am'
+            start_is_pm = start_ampm == 'pm'
+            end_is_am = end_ampm == 'am'
+            end_is_pm = end_ampm == 'pm'
+            
+            # Convert to 24-hour format if AM/PM is specified
+            start_hour = to_24_hour(start_hour, start_is_am, start_is_pm)
+            end_hour = to_24_hour(end_hour, end_is_am, end_is_pm)
+            
+            # Resolve missing AM/PM and overnight ranges into business hours
+            start_hour, end_hour = infer_hour_range(start_hour, end_hour, start_is_am, start_is_pm, end_is_am, end_is_pm)
+            
+            start_time = f"{start_hour:02d}:{start_min:02d}"
+            end_time = f"{end_hour:02d}:{end_min:02d}"
+            
+            logger.info("Parsed working hours: %s to %s", start_time, end_time)
+            
+            # Update all working days with these hours
+            hours_list = [{"start": start_time, "end": end_time}]
+            settings["availability"] = {day: hours_list for day in settings["availability"]}
     
     return settings
 
@@ -1559,19 +2325,18 @@ def get_client_details_from_form(oauth_client, form_id, days_back=7):
     # Calculate start date
     start_date = datetime.now() - timedelta(days=days_back)
     
-    # Get form submissions using updated API
-    response = oauth_client.get_form_submissions(form_id, start_date=start_date)
+    # Submissions embed their field values, so one pass over the list pages (fetched
+    # concurrently past the first) materializes every client with no per-submission reads
+    submissions = oauth_client.get_all_form_submissions(form_id, start_date=start_date)
     
-    if not response or not response.get("submissions"):
+    if submissions is None:
+        logger.error("Could not fetch every page of form submissions; skipping this run rather than onboarding a partial list")
+        return []
+    if not submissions:
         logger.info("No recent form submissions found")
         return []
     
-    submissions = response["submissions"]
-    pagination = response.get("pagination", {})
-    
-    logger.info(f"Found {len(submissions)} form submissions in the last {days_back} days")
-    if pagination.get("total"):
-        logger.info(f"Total submissions available: {pagination['total']}")
+    logger.info("Found %s form submissions in the last %s days", len(submissions), days_back)
     
     # Process each submission
     processed_clients = []
@@ -1588,68 +2353,197 @@ def get_client_details_from_form(oauth_client, form_id, days_back=7):
     
     return processed_clients
 
-def convert_hours_to_est(hour, minute, source_timezone):
+def est_delta_minutes(source_timezone):
     """
-    Convert hours from source timezone to EST/EDT
+    Minutes to add to a wall-clock time in the given timezone to get today's EST/EDT time
     
     Args:
-        hour: Hour in source timezone (24-hour format)
-        minute: Minute in source timezone
-        source_timezone: Source timezone string
+        source_timezone: Source timezone string (e.g. "Central", "PST")
         
     Returns:
-        Tuple of (hour, minute) in EST/EDT
+        int: Offset in minutes, 0 when the timezone is EST/EDT or not recognized
     """
-    # Map common timezone names to proper timezone identifiers
-    timezone_mapping = {
-        "eastern": "America/New_York",
-        "central": "America/Chicago", 
-        "mountain": "America/Denver",
-        "pacific": "America/Los_Angeles",
-        "est": "America/New_York",
-        "edt": "America/New_York",
-        "cst": "America/Chicago",
-        "cdt": "America/Chicago",
-        "mst": "America/Denver", 
-        "mdt": "America/Denver",
-        "pst": "America/Los_Angeles",
-        "pdt": "America/Los_Angeles",
-        "et": "America/New_York",
-        "ct": "America/Chicago",
-        "mt": "America/Denver",
-        "pt": "America/Los_Angeles"
-    }
+    # Get source timezone, defaulting to EST
+    source_tz_str = resolve_timezone(source_timezone) or "America/New_York"
     
-    # Default to EST if timezone not recognized
-    est_tz = pytz.timezone("America/New_York")
+    # If already EST/EDT, no conversion needed
+    if source_tz_str == "America/New_York":
+        return 0
     
-    # Get source timezone
-    source_tz_str = "America/New_York"  # Default to EST
-    source_timezone_lower = source_timezone.lower() if source_timezone else ""
+    return _tz_delta_minutes(source_tz_str, datetime.now().toordinal())
+
+def parse_time_with_ampm(time_str):
+    """
+    Parse a single time like "9", "9:30", "5pm", "12:15 am" or "17:00:00" into 24-hour form
     
-    for key, tz in timezone_mapping.items():
-        if key in source_timezone_lower:
-            source_tz_str = tz
-            break
+    Args:
+        time_str (str): Time string with optional minutes, seconds and AM/PM suffix
     
-    source_tz = pytz.timezone(source_tz_str)
+    Returns:
+        tuple: (hour, minute, is_am, is_pm)
     
-    # If already EST/EDT, no conversion needed
-    if source_tz_str == "America/New_York":
-        return hour, minute
+    Raises:
+        ValueError: If the string is not a recognizable time
+    """
+    match = TIME_AMPM_RE.match(time_str)
+    if not match:
+        raise ValueError(f"Unrecognized time: {time_str!r}")
     
-    # Create a datetime object for today with the specified time in source timezone
-    now = datetime.now()
-    source_time = datetime(now.year, now.month, now.day, hour, minute)
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    ampm = (match.group(3) or "").lower()
+    is_am = ampm == "am"
+    is_pm = ampm == "pm"
     
-    # Make it timezone-aware in source timezone
-    source_time_aware = source_tz.localize(source_time)
+    return to_24_hour(hour, is_am, is_pm), minute, is_am, is_pm
+
+# Calendar openHours day numbers keyed by the lowercase day names in client_data["working_hours"]
+DAY_NUMBER_MAP = {
+    "monday": 1,
+    "tuesday": 2,
+    "wednesday": 3,
+    "thursday": 4,
+    "friday": 5,
+    "saturday": 6,
+    "sunday": 0
+}
+
+# Calendar fields that are the same for every client; per-client fields are
+# merged over this in complete_client_onboarding_with_phone
+CALENDAR_TEMPLATE = {
+    "isActive": True,
+    "calendarType": "round_robin",
+    "widgetType": "classic",
+    "eventType": "RoundRobin_OptimizeForAvailability",
+    "eventColor": "#039be5",
+    "locationConfigurations": [
+        {
+            "kind": "custom",
+            "location": "Phone Call"
+        }
+    ],
+    "slotDuration": 60,
+    "slotDurationUnit": "mins",
+    "slotInterval": 60,
+    "slotIntervalUnit": "mins",
+    "slotBuffer": 0,
+    "slotBufferUnit": "mins",
+    "preBuffer": 15,
+    "preBufferUnit": "mins",
+    "appoinmentPerSlot": 1,
+    "allowBookingAfter": 1,
+    "allowBookingAfterUnit": "hours",
+    "allowBookingFor": 30,
+    "allowBookingForUnit": "days",
+    "enableRecurring": False,
+    "recurring": {
+        "freq": "DAILY",
+        "count": 1,
+        "bookingOption": "skip",
+        "bookingOverlapDefaultStatus": "confirmed"
+    },
+    "formId": "",
+    "stickyContact": True,
+    "isLivePaymentMode": False,
+    "autoConfirm": True,
+    "shouldSendAlertEmailsToAssignedMember": True,
+    "googleInvitationEmails": False,
+    "allowReschedule": True,
+    "allowCancellation": True,
+    "shouldAssignContactToTeamMember": True,
+    "shouldSkipAssigningContactForExisting": False,
+    "pixelId": "",
+    "formSubmitType": "ThankYouMessage",
+    "formSubmitRedirectURL": "",
+    "formSubmitThanksMessage": "Thank you for booking an appointment!",
+    "availabilityType": 0,
+    "guestType": "count_only",
+    "consentLabel": "I agree to receive communications",
+    "calendarCoverImage": "",
+    "notifications": [
+        {
+            "type": "email",
+            "shouldSendToContact": True,
+            "shouldSendToGuest": False,
+            "shouldSendToUser": True,
+            "shouldSendToSelectedUsers": False,
+            "selectedUsers": ""
+        }
+    ]
+}
+
+# Phases reported for (phone purchased, A2P registered, phone assigned)
+PHASES_COMPLETED = {
+    (False, False, False): ("user_creation", "calendar_creation"),
+    (False, False, True): ("user_creation", "calendar_creation", "phone_assignment", "sms_enabled_basic"),
+    (False, True, False): ("user_creation", "calendar_creation", "a2p_registration"),
+    (False, True, True): ("user_creation", "calendar_creation", "a2p_registration", "phone_assignment",
+                          "sms_a2p_compliant"),
+    (True, False, False): ("user_creation", "calendar_creation", "phone_purchase", "phone_ready_for_assignment"),
+    (True, False, True): ("user_creation", "calendar_creation", "phone_purchase", "phone_assignment",
+                          "sms_enabled_basic"),
+    (True, True, False): ("user_creation", "calendar_creation", "phone_purchase", "a2p_registration",
+                          "phone_a2p_ready_for_assignment"),
+    (True, True, True): ("user_creation", "calendar_creation", "phone_purchase", "a2p_registration",
+                         "phone_assignment", "sms_a2p_compliant"),
+}
+
+# SMS readiness (report message, status code) for (phone purchased, A2P registered, phone assigned)
+SMS_STATUS = {
+    (False, False, False): ("Not available", "unavailable"),
+    (False, False, True): ("Not available", "unavailable"),
+    (False, True, False): ("Not available", "unavailable"),
+    (False, True, True): ("Not available", "unavailable"),
+    (True, False, False): ("⚠ Phone available but needs A2P registration and assignment", "unassigned_no_a2p"),
+    (True, False, True): ("⚠ Basic SMS enabled (A2P registration recommended)", "assigned_no_a2p"),
+    (True, True, False): ("⚠ A2P registered but needs phone assignment", "a2p_unassigned"),
+    (True, True, True): ("✓ A2P 10DLC compliant and ready for business use", "assigned_a2p_ready"),
+}
+
+class ClientResult:
+    """Outcome of onboarding one client, holding only what the run summary reports (not the raw API responses)"""
+    
+    __slots__ = ('user_id', 'business_name', 'email', 'password', 'calendar_id', 'phone_number',
+                 'a2p_status', 'phone_assigned', 'phases_completed')
+    
+    def __init__(self, user_id, business_name, email, password, calendar_id, phone_number=None,
+                 a2p_status=None, phone_assigned=False, phases_completed=()):
+        self.user_id = user_id
+        self.business_name = business_name
+        self.email = email
+        self.password = password
+        self.calendar_id = calendar_id
+        self.phone_number = phone_number
+        self.a2p_status = a2p_status
+        self.phone_assigned = phone_assigned
+        self.phases_completed = phases_completed
+
+# Default 9:00-17:00 open hours used when the client gave no parseable working hours
+DEFAULT_OPEN_HOURS = {
+    "openHour": 9,
+    "openMinute": 0,
+    "closeHour": 17,
+    "closeMinute": 0
+}
+
+def purchase_crm_phone_number(zip_codes=None, area_code=None):
+    """
+    Buy a number through the CRM with Phone_Number_Purchase, raising on failure
     
-    # Convert to EST/EDT
-    est_time = source_time_aware.astimezone(est_tz)
+    Phone_Number_Purchase catches its own errors and returns None, so this turns a missing or
+    malformed result into an exception that phone_purchase_breaker counts as a failure.
     
-    # Return the hour and minute in EST/EDT
-    return est_time.hour, est_time.minute
+    Args:
+        zip_codes: ZIP code(s) to search near
+        area_code: Preferred area code
+        
+    Returns:
+        Dict from Phone_Number_Purchase with a "selected_phone_number" entry
+    """
+    result = Phone_Number_Purchase(zip_codes=zip_codes, area_code=area_code)
+    if not (isinstance(result, dict) and result.get("selected_phone_number")):
+        raise RuntimeError(f"Phone number purchase failed or returned unexpected format: {result}")
+    return result
 
 def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_data, phone_preferences=None):
     """
@@ -1662,7 +2556,7 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
         phone_preferences: Dict with phone number preferences
         
     Returns:
-        Dict with all created resources or None if failed
+        ClientResult summarizing the created resources, or None if failed
     """
     logger.info("="*80)
     logger.info("STARTING COMPLETE USER ONBOARDING WITH PHONE NUMBER ASSIGNMENT")
@@ -1670,11 +2564,11 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
     
     # Get business name from form field (mapped from business_name form field)
     business_name = client_data.get('companyName', 'Unknown Client')
-    logger.info(f"Processing client: {business_name}")
+    logger.info("Processing client: %s", business_name)
     
     # Phase 1: Create the user in GHL (assigned to current location)
     logger.info("Phase 1: Creating user in Go High Level...")
-    user_response = oauth_client.create_user(client_data)
+    user_response = ghl_write_limiter.call(oauth_client.create_user, client_data)
     if not user_response:
         logger.error("Phase 1 failed: User creation failed")
         return None
@@ -1683,10 +2577,10 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
     user_email = client_data.get("email")
     user_password = user_response.get("password")
     
-    logger.info(f"✓ Phase 1 complete: Created user with ID: {user_id}")
-    logger.info(f"  User Email: {user_email}")
+    logger.info("✓ Phase 1 complete: Created user with ID: %s", user_id)
+    logger.info("  User Email: %s", user_email)
     if user_password:
-        logger.info(f"  User Password: {user_password}")
+        logger.info("  User Password: %s", user_password)
     
     # Phase 2: Create calendar based on client data
     logger.info("Phase 2: Creating calendar...")
@@ -1717,68 +2611,43 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
             calendar_business_name = business_name
         
         calendar_name = f"{first_name} {calendar_business_name}"
+        calendar_slug = f"{calendar_name.lower().replace(' ', '-')}-appointments"
         
         # Create calendar data structure with working hours from client data
         calendar_data = {
-        "isActive": True,
-        "locationId": oauth_client.location_id,
-        "name": f"{calendar_name} - Appointments",
-        "description": f"Appointment calendar for {calendar_name}",
-        "slug": f"{calendar_name.lower().replace(' ', '-')}-appointments",
-        "widgetSlug": f"{calendar_name.lower().replace(' ', '-')}-appointments",
-        "calendarType": "round_robin",
-        "widgetType": "classic",
-        "eventType": "RoundRobin_OptimizeForAvailability",
-        "eventTitle": f"Appointment with {calendar_name}",
-        "eventColor": "#039be5",
-        "locationConfigurations": [
-            {
-                "kind": "custom",
-                "location": "Phone Call"
-            }
-        ],
-        "teamMembers": [
-            {
-                "userId": user_id,  # Assign user to shared round robin calendar
-                "priority": 1.0,
-                "isPrimary": True,
-                "locationConfigurations": [
-                    {
-                        "kind": "custom",
-                        "location": "Phone Call"
-                    }
-                ]
-            }
-        ],
-        "slotDuration": 60,
-        "slotDurationUnit": "mins",
-        "slotInterval": 60,
-        "slotIntervalUnit": "mins",
-        "slotBuffer": 0,
-        "slotBufferUnit": "mins",
-        "preBuffer": 15,
-        "preBufferUnit": "mins",
-        "appoinmentPerSlot": 1,
+            **CALENDAR_TEMPLATE,
+            "locationId": oauth_client.location_id,
+            "name": f"{calendar_name} - Appointments",
+            "description": f"Appointment calendar for {calendar_name}",
+            "slug": calendar_slug,
+            "widgetSlug": calendar_slug,
+            "eventTitle": f"Appointment with {calendar_name}",
+            "teamMembers": [
+                {
+                    "userId": user_id,  # Assign user to shared round robin calendar
+                    "priority": 1.0,
+                    "isPrimary": True,
+                    "locationConfigurations": [
+                        {
+                            "kind": "custom",
+                            "location": "Phone Call"
+                        }
+                    ]
+                }
+            ],
             "appoinmentPerDay": int(calendar_settings.get("appointments_per_day", 10)),
-        "allowBookingAfter": 1,
-        "allowBookingAfterUnit": "hours",
-        "allowBookingFor": 30,
-        "allowBookingForUnit": "days",
+            "alertEmail": client_data.get("email", ""),
+            "notes": f"Calendar for {calendar_name} - Created via API",
             # Remove timezone property as it's not accepted by the API
             "openHours": []
         }
         
         # Convert working hours from client data to calendar open hours format
         working_hours = calendar_settings.get("working_hours", {})
-        day_number_map = {
-            "monday": 1,
-            "tuesday": 2,
-            "wednesday": 3,
-            "thursday": 4,
-            "friday": 5,
-            "saturday": 6,
-            "sunday": 0
-        }
+        
+        # Client timezone offset to EST/EDT is the same for every day, so compute it once
+        client_timezone = calendar_settings.get("timezone", "America/New_York")
+        est_delta = est_delta_minutes(client_timezone)
         
         # Add working hours to calendar data
         for day, hours in working_hours.items():
@@ -1788,110 +2657,39 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
             # Parse hours like "9:00 - 17:00", "9:30 - 5:30", "11:00 - 6:00", "12 to 2", "12:30 to 3:50"
             try:
                 # Handle different separators: "-", "to", etc.
-                if " - " in hours:
-                    hours_parts = hours.split(" - ")
-                elif " to " in hours:
-                    hours_parts = hours.split(" to ")
-                elif "-" in hours:
-                    hours_parts = hours.split("-")
-                else:
-                    # Default fallback - try to split by space
-                    parts = hours.split()
-                    if len(parts) >= 3 and parts[1].lower() in ["to", "-"]:
-                        hours_parts = [parts[0], parts[2]]
-                    else:
-                        logger.warning(f"Could not parse time format: {hours}")
-                        continue
+                hours_parts = HOURS_SEPARATOR_RE.split(hours, maxsplit=1)
+                if len(hours_parts) != 2:
+                    logger.warning("Could not parse time format: %s", hours)
+                    continue
                 
                 start_time = hours_parts[0].strip()
                 end_time = hours_parts[1].strip()
                 
-                # Helper function to parse time with AM/PM handling
-                def parse_time_with_ampm(time_str):
-                    # Check for AM/PM indicators
-                    time_lower = time_str.lower()
-                    is_pm = 'pm' in time_lower
-                    is_am = 'am' in time_lower
-                    
-                    # Remove AM/PM indicators for parsing
-                    time_str = time_lower.replace('am', '').replace('pm', '').strip()
-                    
-                    # Parse hours and minutes
-                    if ':' in time_str:
-                        parts = time_str.split(':')
-                        hour = int(parts[0])
-                        minute = int(parts[1]) if len(parts) > 1 else 0
-                    else:
-                        hour = int(time_str)
-                        minute = 0
-                    
-                    # Convert to 24-hour format if PM
-                    if is_pm and hour < 12:
-                        hour += 12
-                    elif is_am and hour == 12:
-                        hour = 0
-                    
-                    return hour, minute, is_am, is_pm
-                
                 # Parse start and end times
                 start_hour, start_minute, start_is_am, start_is_pm = parse_time_with_ampm(start_time)
                 end_hour, end_minute, end_is_am, end_is_pm = parse_time_with_ampm(end_time)
                 
-                # Handle cases where AM/PM is not specified
-                if not (start_is_am or start_is_pm) and not (end_is_am or end_is_pm):
-                    # If both times have no AM/PM indicator
-                    
-                    # Case 1: Both times are in the same half of the day
-                    if (start_hour < 12 and end_hour < 12) or (start_hour >= 12 and end_hour >= 12):
-                        # If end time is less than start time, assume end time is PM if both are AM
-                        if end_hour < start_hour and start_hour < 12:
-                            end_hour += 12
-                    
-                    # Case 2: Likely crossing from AM to PM
-                    elif start_hour < 12 and end_hour >= 12:
-                        # This is already correct (e.g., 10 to 14)
-                        pass
-                    
-                    # Case 3: Likely crossing from PM to AM (overnight)
-                    elif start_hour >= 12 and end_hour < 12:
-                        # This is unusual but possible (e.g., 22 to 2)
-                        # We'll assume this is not overnight and end time is PM
-                        end_hour += 12
-                    
-                    # Special case: Both times are small numbers
-                    if start_hour < 7 and end_hour < 7:
-                        # Assume business hours (e.g., 5 to 6 likely means 5PM to 6PM)
-                        start_hour += 12
-                        end_hour += 12
-                
-                # Special case: If end hour is still less than start hour, it might be overnight
-                # But in business context, it's more likely both are PM or both are AM
-                if end_hour < start_hour:
-                    # If end hour is very small (1-6) and start hour is larger, assume end is PM
-                    if end_hour < 7 and not end_is_am:
-                        end_hour += 12
-                
-                # Get client timezone from settings
-                client_timezone = calendar_settings.get("timezone", "America/New_York")
+                # Resolve missing AM/PM and overnight ranges into business hours
+                start_hour, end_hour = infer_hour_range(start_hour, end_hour, start_is_am, start_is_pm, end_is_am, end_is_pm)
                 
                 # Convert hours to EST/EDT if client timezone is different
-                if client_timezone and client_timezone != "America/New_York":
-                    logger.info(f"Converting hours from {client_timezone} to EST/EDT")
-                    logger.info(f"Original hours: {start_hour}:{start_minute:02d} - {end_hour}:{end_minute:02d}")
+                if est_delta:
+                    logger.info("Converting hours from %s to EST/EDT", client_timezone)
+                    logger.info("Original hours: %s:%02d - %s:%02d", start_hour, start_minute, end_hour, end_minute)
                     
                     # Convert start time
-                    start_hour, start_minute = convert_hours_to_est(start_hour, start_minute, client_timezone)
+                    start_hour, start_minute = divmod((start_hour * 60 + start_minute + est_delta) % 1440, 60)
                     
                     # Convert end time
-                    end_hour, end_minute = convert_hours_to_est(end_hour, end_minute, client_timezone)
+                    end_hour, end_minute = divmod((end_hour * 60 + end_minute + est_delta) % 1440, 60)
                     
-                    logger.info(f"Converted hours: {start_hour}:{start_minute:02d} - {end_hour}:{end_minute:02d}")
+                    logger.info("Converted hours: %s:%02d - %s:%02d", start_hour, start_minute, end_hour, end_minute)
                 
-                logger.info(f"Final {day} hours in EST/EDT: {start_hour}:{start_minute:02d} - {end_hour}:{end_minute:02d}")
+                logger.info("Final %s hours in EST/EDT: %s:%02d - %s:%02d", day, start_hour, start_minute, end_hour, end_minute)
                 
                 # Add to open hours
                 calendar_data["openHours"].append({
-                    "daysOfTheWeek": [day_number_map.get(day.lower(), 1)],
+                    "daysOfTheWeek": [DAY_NUMBER_MAP.get(day, 1)],
                     "hours": [
                         {
                             "openHour": start_hour,
@@ -1902,117 +2700,24 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
                     ]
                 })
             except Exception as e:
-                logger.warning(f"Could not parse working hours for {day}: {hours} - {e}")
+                logger.warning("Could not parse working hours for %s: %s - %s", day, hours, e)
         
         # If no working hours were added, add default hours
         if not calendar_data["openHours"]:
+            # Monday (1) through Friday (5)
             calendar_data["openHours"] = [
-            {
-                "daysOfTheWeek": [1],  # Monday
-                "hours": [
-                    {
-                        "openHour": 9,
-                        "openMinute": 0,
-                        "closeHour": 17,
-                        "closeMinute": 0
-                    }
-                ]
-            },
-            {
-                "daysOfTheWeek": [2],  # Tuesday
-                "hours": [
-                    {
-                        "openHour": 9,
-                        "openMinute": 0,
-                        "closeHour": 17,
-                        "closeMinute": 0
-                    }
-                ]
-            },
-            {
-                "daysOfTheWeek": [3],  # Wednesday
-                "hours": [
-                    {
-                        "openHour": 9,
-                        "openMinute": 0,
-                        "closeHour": 17,
-                        "closeMinute": 0
-                    }
-                ]
-            },
-            {
-                "daysOfTheWeek": [4],  # Thursday
-                "hours": [
-                    {
-                        "openHour": 9,
-                        "openMinute": 0,
-                        "closeHour": 17,
-                        "closeMinute": 0
-                    }
-                ]
-            },
-            {
-                "daysOfTheWeek": [5],  # Friday
-                "hours": [
-                    {
-                        "openHour": 9,
-                        "openMinute": 0,
-                        "closeHour": 17,
-                        "closeMinute": 0
-                    }
-                ]
-            }
+                {"daysOfTheWeek": [day_number], "hours": [dict(DEFAULT_OPEN_HOURS)]}
+                for day_number in range(1, 6)
             ]
         
-        # Add other calendar settings
-        calendar_data.update({
-        "enableRecurring": False,
-        "recurring": {
-            "freq": "DAILY",
-            "count": 1,
-            "bookingOption": "skip",
-            "bookingOverlapDefaultStatus": "confirmed"
-        },
-        "formId": "",
-        "stickyContact": True,
-        "isLivePaymentMode": False,
-        "autoConfirm": True,
-        "shouldSendAlertEmailsToAssignedMember": True,
-        "alertEmail": client_data.get("email", ""),
-        "googleInvitationEmails": False,
-        "allowReschedule": True,
-        "allowCancellation": True,
-        "shouldAssignContactToTeamMember": True,
-        "shouldSkipAssigningContactForExisting": False,
-        "notes": f"Calendar for {calendar_name} - Created via API",
-        "pixelId": "",
-        "formSubmitType": "ThankYouMessage",
-        "formSubmitRedirectURL": "",
-        "formSubmitThanksMessage": "Thank you for booking an appointment!",
-        "availabilityType": 0,
-        "guestType": "count_only",
-        "consentLabel": "I agree to receive communications",
-        "calendarCoverImage": "",
-        "notifications": [
-            {
-                "type": "email",
-                "shouldSendToContact": True,
-                "shouldSendToGuest": False,
-                "shouldSendToUser": True,
-                "shouldSendToSelectedUsers": False,
-                "selectedUsers": ""
-            }
-        ]
-        })
-        
-        calendar_response = oauth_client.create_calendar(calendar_data)
+        calendar_response = ghl_write_limiter.call(oauth_client.create_calendar, calendar_data)
         if not calendar_response:
             logger.error("Phase 2 failed: Calendar creation failed")
             # Don't return None here, continue with the process even if calendar creation fails
             calendar_id = None
         else:
             calendar_id = calendar_response.get("id")
-        logger.info(f"✓ Phase 2 complete: Created calendar with ID: {calendar_id}")
+        logger.info("✓ Phase 2 complete: Created calendar with ID: %s", calendar_id)
         logger.info("✓ Shared calendar created with user assigned to round robin team")
     
     # Phase 3: Purchase phone number using login_ghl.py implementation
@@ -2025,121 +2730,116 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
     # Check for ZIP codes in the client_data directly (from business fields)
     if client_data.get("zip_codes_for_targeting"):
         zip_codes = client_data["zip_codes_for_targeting"]
-        logger.info(f"Using ZIP codes from business fields: {zip_codes}")
-    # If not found, check custom fields
-    else:
-        for custom_field in client_data.get("customFields", []):
-            if custom_field.get("key") == "contact.zip_codes_for_targeting_locations" or "zip_code" in custom_field.get("key", "").lower():
-                zip_codes = custom_field.get("field_value", "")
-                logger.info(f"Using ZIP codes from custom fields: {zip_codes}")
-                break
+        logger.info("Using ZIP codes from business fields: %s", zip_codes)
+    
+    # Use an explicit area code if the form provided one
+    if client_data.get("area_code"):
+        area_code = client_data["area_code"]
+        logger.info("Found area code %s in client data", area_code)
     
-    # If no ZIP codes found in business fields or custom fields, try address as fallback
+    # If no ZIP codes found in business fields, try address as fallback
     if not zip_codes and client_data.get("address", {}).get("postalCode"):
         zip_codes = client_data["address"]["postalCode"]
-        logger.info(f"No ZIP codes found in business fields, using address postal code: {zip_codes}")
-    
-    # Check for area code in custom fields
-    for custom_field in client_data.get("customFields", []):
-        if "area_code" in custom_field.get("key", "").lower():
-            area_code_value = custom_field.get("field_value", "")
-            # Extract just the digits if there are any
-            import re
-            area_code_match = re.search(r'\d{3}', area_code_value)
-            if area_code_match:
-                area_code = area_code_match.group(0)
-                logger.info(f"Found area code {area_code} in custom field")
-                break
+        logger.info("No ZIP codes found in business fields, using address postal code: %s", zip_codes)
     
     # Try to derive area code from ZIP codes if we have them but no area code
     if not area_code and zip_codes:
-        try:
-            # Try to import area_code module
-            import area_code as area_code_module
+        if area_code_module is not None:
             best_area_code, all_area_codes, common_codes = area_code_module.get_best_area_code(zip_codes)
             if best_area_code:
                 area_code = best_area_code
-                logger.info(f"Derived area code {area_code} from ZIP codes {zip_codes}")
-        except ImportError:
+                logger.info("Derived area code %s from ZIP codes %s", area_code, zip_codes)
+        else:
             logger.warning("area_code module not available for ZIP to area code conversion")
     
     # Call Phone_Number_Purchase from login_ghl.py with explicit instructions
     try:
-        logger.info(f"Calling Phone_Number_Purchase with ZIP codes: {zip_codes} and area code: {area_code}")
+        logger.info("Calling Phone_Number_Purchase with ZIP codes: %s and area code: %s", zip_codes, area_code)
         logger.info("IMPORTANT: Will select the FIRST visible number in the table and click its radio button")
         
-        # Pass both zip_codes and area_code to the function
-        phone_purchase_result = Phone_Number_Purchase(zip_codes=zip_codes, area_code=area_code)
-        
-        if phone_purchase_result and isinstance(phone_purchase_result, dict) and phone_purchase_result.get("selected_phone_number"):
-            phone_number = phone_purchase_result["selected_phone_number"]["phone_number"]
-            logger.info(f"✓ Phase 3 complete: Purchased phone number: {phone_number}")
-            
-            # Create a phone_result object compatible with the rest of the code
-            phone_result = {
-                'sid': 'CRM_PURCHASED',  # Not a Twilio SID but we need something
-                'phone_number': phone_number,
-                'friendly_name': f"{business_name} - {phone_number}",
-                'capabilities': {
-                    'voice': True,
-                    'sms': True,
-                    'mms': False
-                },
-                'date_created': datetime.now().isoformat(),
-                'status': 'active',
-                'client_info': {
-                    'business_name': business_name,
-                    'requested_zip_codes': zip_codes,
-                    'requested_area_code': area_code
-                }
+        # Pass both zip_codes and area_code to the function; the browser-driven
+        # purchase shares one CRM login, so only one runs at a time
+        with _phone_purchase_lock:
+            phone_purchase_result = phone_purchase_breaker.call(purchase_crm_phone_number, zip_codes, area_code)
+        
+        phone_number = phone_purchase_result["selected_phone_number"]["phone_number"]
+        logger.info("✓ Phase 3 complete: Purchased phone number: %s", phone_number)
+        
+        # Create a phone_result object compatible with the rest of the code
+        phone_result = {
+            'sid': 'CRM_PURCHASED',  # Not a Twilio SID but we need something
+            'phone_number': phone_number,
+            'friendly_name': f"{business_name} - {phone_number}",
+            'capabilities': {
+                'voice': True,
+                'sms': True,
+                'mms': False
+            },
+            'date_created': datetime.now().isoformat(),
+            'status': 'active',
+            'client_info': {
+                'business_name': business_name,
+                'requested_zip_codes': zip_codes,
+                'requested_area_code': area_code
             }
-            
-            # Log area code match information
-            if area_code:
-                # Extract area code correctly - format is "+1 XXX-XXX-XXXX"
-                purchased_area_code = phone_number.split(" ")[1].split("-")[0] if " " in phone_number else phone_number[2:5]
-                if purchased_area_code == area_code:
-                    logger.info(f"✓ Phone number matches requested area code: {area_code}")
-                else:
-                    logger.info(f"⚠ Phone number has different area code. Requested: {area_code}, Got: {purchased_area_code}")
-        else:
-            logger.error("Phase 3 failed: Phone number purchase failed or returned unexpected format")
-            logger.error(f"Phone purchase result: {phone_purchase_result}")
-            phone_result = None
+        }
+        
+        # Log area code match information
+        if area_code:
+            purchased_area_code = area_code_of(phone_number)
+            if purchased_area_code == area_code:
+                logger.info("✓ Phone number matches requested area code: %s", area_code)
+            else:
+                logger.info("⚠ Phone number has different area code. Requested: %s, Got: %s", area_code, purchased_area_code)
+    except CircuitBreakerOpenError as e:
+        logger.warning("Phase 3 skipped: %s", e)
+        phone_result = None
     except Exception as e:
-        logger.error(f"Phase 3 failed: Error purchasing phone number: {e}")
+        logger.error("Phase 3 failed: Error purchasing phone number: %s", e)
         phone_result = None
 
     # Phase 3.5: A2P 10DLC Registration (required for SMS compliance)
     logger.info("Phase 3.5: A2P 10DLC Registration for SMS compliance...")
     
     a2p_result = None
+    a2p_status = None
     if phone_result and twilio_manager:
         try:
-            # Add phone number info to client data for A2P registration
-            client_data_with_phone = client_data.copy()
-            client_data_with_phone['phone_number'] = phone_result['phone_number']
-            
-            a2p_result = twilio_manager.register_a2p_10dlc(client_data_with_phone)
+            a2p_result = twilio_breaker.call(twilio_manager.register_a2p_10dlc, client_data,
+                                             phone_number=phone_result['phone_number'])
             if a2p_result:
-                logger.info(f"✓ Phase 3.5 complete: A2P 10DLC registration successful")
-                logger.info(f"  Messaging Service SID: {a2p_result['messaging_service'].sid}")
-                logger.info(f"  Registration Status: {a2p_result['status']}")
+                # Read each Twilio resource's SID once; logging and the results reuse these
+                messaging_service = a2p_result.get('messaging_service')
+                brand_registration = a2p_result.get('brand_registration')
+                campaign_registration = a2p_result.get('campaign_registration')
+                a2p_status = {
+                    "messaging_service_sid": messaging_service.sid if messaging_service else None,
+                    "brand_registration_sid": brand_registration.sid if brand_registration else None,
+                    "campaign_registration_sid": campaign_registration.sid if campaign_registration else None,
+                    "status": a2p_result.get('status', 'unknown')
+                }
                 
-                if a2p_result.get('brand_registration'):
-                    logger.info(f"  Brand Registration SID: {a2p_result['brand_registration'].sid}")
+                logger.info("✓ Phase 3.5 complete: A2P 10DLC registration successful")
+                logger.info("  Messaging Service SID: %s", a2p_status["messaging_service_sid"])
+                logger.info("  Registration Status: %s", a2p_status["status"])
+                
+                if a2p_status["brand_registration_sid"]:
+                    logger.info("  Brand Registration SID: %s", a2p_status["brand_registration_sid"])
                 else:
                     logger.info("  Brand Registration: Skipped (already exists)")
                     
-                if a2p_result.get('campaign_registration'):
-                    logger.info(f"  Campaign Registration SID: {a2p_result['campaign_registration'].sid}")
+                if a2p_status["campaign_registration_sid"]:
+                    logger.info("  Campaign Registration SID: %s", a2p_status["campaign_registration_sid"])
                 else:
                     logger.info("  Campaign Registration: Not created (brand registration pending)")
             else:
                 logger.error("Phase 3.5 failed: A2P 10DLC registration failed")
+        except CircuitBreakerOpenError as e:
+            logger.warning("Phase 3.5 skipped: %s", e)
+            a2p_result = a2p_status = None
         except Exception as e:
-            logger.error(f"Phase 3.5 failed: Error in A2P 10DLC registration: {e}")
-            a2p_result = None
+            logger.error("Phase 3.5 failed: Error in A2P 10DLC registration: %s", e)
+            a2p_result = a2p_status = None
     else:
         if not phone_result:
             logger.info("Phase 3.5 skipped: No phone number to register for A2P")
@@ -2156,65 +2856,87 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
             # Format the phone number correctly (remove any spaces or special characters)
             formatted_phone = phone_result['phone_number']
             if formatted_phone.startswith('+'):
-                formatted_phone = '+' + ''.join(c for c in formatted_phone[1:] if c.isdigit())
+                formatted_phone = '+' + NON_DIGIT_RE.sub('', formatted_phone)
             else:
-                formatted_phone = '+1' + ''.join(c for c in formatted_phone if c.isdigit())
+                formatted_phone = '+1' + NON_DIGIT_RE.sub('', formatted_phone)
+            
+            logger.info("Formatted phone number for assignment: %s", formatted_phone)
             
-            logger.info(f"Formatted phone number for assignment: {formatted_phone}")
+            # Same key for the PUT, its retry and the conversations fallback (and for a re-run
+            # of this user/number pair), so a write whose response was lost isn't applied twice
+            idempotency_key = hashlib.sha256(f"{user_id}:{formatted_phone}".encode()).hexdigest()[:32]
+            idempotency_headers = {"Idempotency-Key": idempotency_key}
             
             # Based on our testing, we need to update the regular 'phone' field
             user_update_data = {
                 "phone": formatted_phone
             }
             
-            logger.info(f"Assigning phone number {formatted_phone} to user's 'phone' field")
+            logger.info("Assigning phone number %s to user's 'phone' field", formatted_phone)
             
             # Use the user update API endpoint with the correct version header
             update_endpoint = f"/users/{user_id}"
             
-            # Custom headers for user API
-            user_headers = {
-                "Version": "2021-07-28"  # Specific version for user API
-            }
-            
-            update_response = oauth_client.make_api_request("PUT", update_endpoint, data=user_update_data, headers=user_headers)
+            # Keep the status so a permanent failure isn't retried through the fallback below;
+            # 0 stands for a request that never got a response (connection error or timeout)
+            try:
+                put_response = oauth_client.make_api_request("PUT", update_endpoint, data=user_update_data,
+                                                             api_version=GHL_USERS_API_VERSION,
+                                                             extra_headers=idempotency_headers,
+                                                             return_response=True)
+                put_status = put_response.status_code
+            except requests.RequestException as e:
+                logger.error("User update request failed: PUT %s - %s", update_endpoint, e)
+                put_response, put_status = None, 0
+            
+            update_response = put_response.json() if put_status in (200, 201) else None
+            if put_response is not None and put_status not in (200, 201):
+                logger.error("API request failed: PUT %s - %s - %s", update_endpoint, put_status, put_response.text)
             
             if update_response:
-                logger.info(f"✓ Phase 4 complete: Phone number {formatted_phone} assigned to user")
-                logger.info(f"  User phone field updated successfully")
+                logger.info("✓ Phase 4 complete: Phone number %s assigned to user", formatted_phone)
+                logger.info("  User phone field updated successfully")
                 
-                # Verify the update was successful by checking the user's details
-                get_user_response = oauth_client.make_api_request("GET", update_endpoint, headers=user_headers)
-                if get_user_response:
-                    user_phone = get_user_response.get("phone", "")
+                # Verify the update from the user echoed back by the PUT; only re-fetch
+                # the user when verification is enabled and the PUT omitted the phone
+                user_phone = update_response.get("phone") if isinstance(update_response, dict) else None
+                if user_phone is None and VERIFY_PHONE_ASSIGNMENT:
+                    get_user_response = oauth_client.make_api_request("GET", update_endpoint, api_version=GHL_USERS_API_VERSION)
+                    if get_user_response:
+                        user_phone = get_user_response.get("phone", "")
+                if user_phone is not None:
                     if user_phone == formatted_phone:
-                        logger.info(f"✓ Verification successful: User phone field contains {formatted_phone}")
+                        logger.info("✓ Verification successful: User phone field contains %s", formatted_phone)
                     else:
-                        logger.warning(f"⚠ Verification issue: User phone field contains {user_phone}, expected {formatted_phone}")
+                        logger.warning("⚠ Verification issue: User phone field contains %s, expected %s", user_phone, formatted_phone)
                 
                 phone_assignment_result = update_response
+            elif 400 <= put_status < 500:
+                # 4xx (auth, permissions, unknown user, bad data) fails the same way on any endpoint
+                logger.error("Phase 4 failed: Could not assign phone number to user (permanent failure %s)", put_status)
             else:
                 logger.error("Phase 4 failed: Could not assign phone number to user")
                 
-                # Try alternative approach - use conversations API if available
+                # Server or network error - try the conversations API instead
                 logger.info("Trying alternative approach for phone assignment...")
                 try:
                     # Try to use the conversations API to assign the phone number
                     conv_endpoint = f"/locations/{oauth_client.location_id}/conversations/users/{user_id}/phone"
                     conv_data = {"phone": formatted_phone}
                     
-                    conv_response = oauth_client.make_api_request("POST", conv_endpoint, data=conv_data)
+                    conv_response = oauth_client.make_api_request("POST", conv_endpoint, data=conv_data,
+                                                                  extra_headers=idempotency_headers)
                     
                     if conv_response:
-                        logger.info(f"✓ Alternative approach successful: Phone number assigned via conversations API")
+                        logger.info("✓ Alternative approach successful: Phone number assigned via conversations API")
                         phone_assignment_result = conv_response
                     else:
                         logger.error("Alternative approach failed: Could not assign phone number via conversations API")
                 except Exception as e:
-                    logger.error(f"Error in alternative approach: {e}")
+                    logger.error("Error in alternative approach: %s", e)
                 
         except Exception as e:
-            logger.error(f"Phase 4 failed: Error assigning phone number to user: {e}")
+            logger.error("Phase 4 failed: Error assigning phone number to user: %s", e)
             phone_assignment_result = None
     else:
         if not phone_result:
@@ -2223,100 +2945,39 @@ def complete_client_onboarding_with_phone(oauth_client, twilio_manager, client_d
             logger.info("Phase 4 skipped: User already exists")
         phone_assignment_result = None
 
-    # Compile results
-    results = {
-        "user": {
-            "id": user_id,
-            "data": user_response,
-            "business_name": business_name,
-            "email": user_email,
-            "password": user_password
-        },  
-        "calendar": {
-            "id": calendar_id,
-            "data": calendar_response,
-            "settings": calendar_settings
-        },
-        "phone": phone_result,
-        "a2p_registration": a2p_result,
-        "phone_assignment": phone_assignment_result,
-        "success": True,
-        "phases_completed": ["user_creation", "calendar_creation"]
-    }
-    
-    if phone_result:
-        results["phases_completed"].append("phone_purchase")
-    
-    if a2p_result:
-        results["phases_completed"].append("a2p_registration")
-        # Add A2P status details
-        results["a2p_status"] = {
-            "messaging_service_sid": a2p_result['messaging_service'].sid if a2p_result.get('messaging_service') else None,
-            "brand_registration_sid": a2p_result['brand_registration'].sid if a2p_result.get('brand_registration') else None,
-            "campaign_registration_sid": a2p_result['campaign_registration'].sid if a2p_result.get('campaign_registration') else None,
-            "status": a2p_result.get('status', 'unknown')
-        }
-    
-    if phone_assignment_result:
-        results["phases_completed"].append("phone_assignment")
-        if a2p_result:
-            results["phases_completed"].append("sms_a2p_compliant")
-        else:
-            results["phases_completed"].append("sms_enabled_basic")
-    elif phone_result:
-        # Phone purchased but not assigned
-        if a2p_result:
-            results["phases_completed"].append("phone_a2p_ready_for_assignment")
-        else:
-            results["phases_completed"].append("phone_ready_for_assignment")
+    # Keep only what the summary needs, so a large batch doesn't hold every client's API responses
+    result = ClientResult(
+        user_id=user_id,
+        business_name=business_name,
+        email=user_email,
+        password=user_password,
+        calendar_id=calendar_id,
+        phone_number=phone_result['phone_number'] if phone_result else None,
+        a2p_status=a2p_status,
+        phone_assigned=bool(phone_assignment_result),
+        phases_completed=PHASES_COMPLETED[bool(phone_result), bool(a2p_result), bool(phone_assignment_result)]
+    )
     
-    logger.info("="*80)
-    logger.info("USER ONBOARDING COMPLETE")
-    logger.info("="*80)
-    logger.info(f"Business: {business_name}")
-    logger.info(f"User ID: {user_id}")
-    logger.info(f"User Email: {user_email}")
-    if user_password:
-        logger.info(f"User Password: {user_password}")
-    logger.info(f"Calendar ID: {calendar_id}")
-    if phone_result:
-        logger.info(f"Phone Number: {phone_result['phone_number']}")
-        
-        # A2P Registration Status
-        if a2p_result:
-            logger.info(f"A2P Registration: ✓ Completed")
-            logger.info(f"  Messaging Service: {a2p_result['messaging_service'].sid}")
-            logger.info(f"  Registration Status: {a2p_result.get('status', 'unknown')}")
-            if a2p_result.get('brand_registration'):
-                logger.info(f"  Brand Registration: {a2p_result['brand_registration'].sid}")
-            else:
-                logger.info(f"  Brand Registration: Skipped (already exists)")
-        else:
-            logger.info(f"A2P Registration: ⚠ Not completed")
-        
-        # Phone Assignment Status
-        if phone_assignment_result:
-            logger.info(f"Phone Assignment: ✓ Assigned to user in CRM")
-            if results.get('a2p_registration'):
-                logger.info(f"SMS Status: ✓ A2P 10DLC compliant and ready for business use")
-            else:
-                logger.info(f"SMS Status: ⚠ Basic SMS enabled (A2P registration recommended)")
-        else:
-            logger.info(f"Phone Assignment: ⚠ Phone purchased but not assigned")
-            if results.get('a2p_registration'):
-                logger.info(f"SMS Status: ⚠ A2P registered but needs phone assignment")
-            else:
-                logger.info(f"SMS Status: ⚠ Phone available but needs A2P registration and assignment")
-    else:
-        logger.info(f"Phone Number: Not purchased")
-        logger.info(f"A2P Registration: Not applicable")
-        logger.info(f"SMS Status: Not available")
-    logger.info(f"Phases Completed: {', '.join(results['phases_completed'])}")
-    logger.info("="*80)
+    # One structured record per client instead of a multi-line block; the password is
+    # already logged at Phase 1 and printed in the end-of-run report
+    summary = {
+        "event": "onboarding_summary",
+        "business": result.business_name,
+        "user_id": result.user_id,
+        "user_email": result.email,
+        "calendar_id": result.calendar_id,
+        "phone": result.phone_number,
+        "a2p": result.a2p_status,
+        "phone_assigned": result.phone_assigned,
+        "sms_status": SMS_STATUS[bool(phone_result), bool(a2p_result), bool(phone_assignment_result)][1],
+        "phases_completed": result.phases_completed
+    }
+    logger.info("USER ONBOARDING COMPLETE %s", orjson.dumps(summary).decode())
     
-    return results
+    return result
 
-def process_recent_form_submissions_with_phone(oauth_client, twilio_manager, form_id, days_back=7, phone_preferences=None):
+def process_recent_form_submissions_with_phone(oauth_client, twilio_manager, form_id, days_back=7, phone_preferences=None,
+                                               max_workers=ONBOARDING_MAX_WORKERS):
     """
     Process recent form submissions and complete full onboarding including phone numbers
     
@@ -2326,11 +2987,12 @@ def process_recent_form_submissions_with_phone(oauth_client, twilio_manager, for
         form_id: Form ID to check for submissions
         days_back: Number of days to look back for submissions
         phone_preferences: Dict with phone number preferences
+        max_workers: Maximum number of clients onboarded concurrently
         
     Returns:
-        List of onboarding results
+        List of ClientResult, one per successfully onboarded client
     """
-    logger.info(f"Processing form submissions from the last {days_back} days...")
+    logger.info("Processing form submissions from the last %s days...", days_back)
     
     # Get client details from form submissions
     client_list = get_client_details_from_form(oauth_client, form_id, days_back)
@@ -2339,10 +3001,10 @@ def process_recent_form_submissions_with_phone(oauth_client, twilio_manager, for
         logger.info("No clients to process")
         return []
     
-    results = []
-    
-    for i, client_data in enumerate(client_list, 1):
-        logger.info(f"\n--- Processing Client {i}/{len(client_list)} ---")
+    def onboard(indexed_client):
+        i, client_data = indexed_client
+        logger.info("\n--- Processing Client %s/%s: %s ---", i, len(client_list),
+                    client_data.get('companyName', client_data.get('name', 'Unknown')))
         
         try:
             result = complete_client_onboarding_with_phone(
@@ -2353,19 +3015,21 @@ def process_recent_form_submissions_with_phone(oauth_client, twilio_manager, for
             )
             
             if result:
-                results.append(result)
-                logger.info(f"✓ Successfully processed: {result['user']['business_name']}")
-            else:
-                logger.error(f"✗ Failed to process client: {client_data.get('companyName', client_data.get('name', 'Unknown'))}")
+                logger.info("✓ Successfully processed: %s", result.business_name)
+                return result
+            logger.error("✗ Failed to process client: %s", client_data.get('companyName', client_data.get('name', 'Unknown')))
                 
         except Exception as e:
-            logger.error(f"✗ Error processing client: {e}")
-        
-        # Add a small delay between processing clients
-        if i < len(client_list):
-            time.sleep(2)
+            logger.error("✗ Error processing client: %s", e)
+        return None
     
-    logger.info(f"\nProcessing complete: {len(results)}/{len(client_list)} clients successfully onboarded")
+    # Clients are independent, so overlap their API round-trips; the GHL and
+    # Twilio rate limiters pace the combined request rate. Workers are named
+    # onboard_N (shown in every log line) so interleaved output can be attributed.
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(client_list)), thread_name_prefix="onboard") as executor:
+        results = [result for result in executor.map(onboard, enumerate(client_list, 1)) if result]
+    
+    logger.info("\nProcessing complete: %s/%s clients successfully onboarded", len(results), len(client_list))
     return results
 
 def main():
@@ -2375,11 +3039,8 @@ def main():
     print("="*80)
     
     # Check required environment variables
-    required_vars = ["GHL_CLIENT_ID", "GHL_CLIENT_SECRET"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-    
-    if missing_vars:
-        logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+    if MISSING_REQUIRED_VARS:
+        logger.error("Missing required environment variables: %s", ', '.join(MISSING_REQUIRED_VARS))
         logger.error("Please set these in your .env file")
         return
     
@@ -2389,6 +3050,8 @@ def main():
         client_secret=GHL_CLIENT_SECRET,
         redirect_uri=GHL_REDIRECT_URI
     )
+    # Release the pooled GHL connections however main() exits
+    atexit.register(oauth_client.close)
     
     # Perform OAuth flow
     if not perform_oauth_flow(oauth_client):
@@ -2401,7 +3064,7 @@ def main():
         twilio_manager = TwilioPhoneManager()
         logger.info("✓ Twilio integration enabled")
     except Exception as e:
-        logger.warning(f"Twilio initialization failed: {e}")
+        logger.warning("Twilio initialization failed: %s", e)
         logger.warning("Continuing without phone number purchasing...")
     
     # Phone number preferences (customize as needed)
@@ -2425,57 +3088,51 @@ def main():
         )
         
         if results:
-            print("\n" + "="*80)
-            print("SUMMARY REPORT")
-            print("="*80)
+            # Build the whole report and write it once
+            report = ["\n" + "="*80, "SUMMARY REPORT", "="*80]
             
             for i, result in enumerate(results, 1):
-                print(f"\n{i}. {result['user']['business_name']}")
-                print(f"   User ID: {result['user']['id']}")
-                print(f"   User Email: {result['user']['email']}")
-                if result['user']['password']:
-                    print(f"   User Password: {result['user']['password']}")
-                print(f"   Calendar ID: {result['calendar']['id']}")
+                report.append(f"\n{i}. {result.business_name}")
+                report.append(f"   User ID: {result.user_id}")
+                report.append(f"   User Email: {result.email}")
+                if result.password:
+                    report.append(f"   User Password: {result.password}")
+                report.append(f"   Calendar ID: {result.calendar_id}")
                 
-                if result.get('phone'):
-                    print(f"   Phone: {result['phone']['phone_number']}")
+                if result.phone_number:
+                    report.append(f"   Phone: {result.phone_number}")
                     
                     # A2P Registration Status
-                    if result.get('a2p_registration'):
-                        a2p_status = result.get('a2p_status', {})
-                        print(f"   A2P Registration: ✓ {a2p_status.get('status', 'completed')}")
+                    if result.a2p_status:
+                        a2p_status = result.a2p_status
+                        report.append(f"   A2P Registration: ✓ {a2p_status.get('status', 'completed')}")
                         if a2p_status.get('messaging_service_sid'):
-                            print(f"   Messaging Service: {a2p_status['messaging_service_sid']}")
+                            report.append(f"   Messaging Service: {a2p_status['messaging_service_sid']}")
                     else:
-                        print(f"   A2P Registration: ⚠ Not completed")
+                        report.append(f"   A2P Registration: ⚠ Not completed")
                     
                     # Phone Assignment Status
-                    if result.get('phone_assignment'):
-                        print(f"   Phone Assignment: ✓ Assigned to user in CRM")
-                        if result.get('a2p_registration'):
-                            print(f"   SMS: ✓ A2P 10DLC compliant and ready for business use")
-                        else:
-                            print(f"   SMS: ⚠ Basic SMS enabled (A2P registration recommended)")
+                    if result.phone_assigned:
+                        report.append(f"   Phone Assignment: ✓ Assigned to user in CRM")
                     else:
-                        print(f"   Phone Assignment: ⚠ Phone purchased but not assigned")
-                        if result.get('a2p_registration'):
-                            print(f"   SMS: ⚠ A2P registered but needs phone assignment")
-                        else:
-                            print(f"   SMS: ⚠ Phone available but needs A2P registration and assignment")
+                        report.append(f"   Phone Assignment: ⚠ Phone purchased but not assigned")
                 else:
-                    print(f"   Phone: Not purchased")
-                    print(f"   A2P Registration: Not applicable")
-                    print(f"   SMS: Not available")
+                    report.append(f"   Phone: Not purchased")
+                    report.append(f"   A2P Registration: Not applicable")
+                
+                sms_message = SMS_STATUS[bool(result.phone_number), bool(result.a2p_status), result.phone_assigned][0]
+                report.append(f"   SMS: {sms_message}")
                 
-                print(f"   Phases: {', '.join(result['phases_completed'])}")
+                report.append(f"   Phases: {', '.join(result.phases_completed)}")
             
-            print(f"\nTotal users created: {len(results)}")
-            print("="*80)
+            report.append(f"\nTotal users created: {len(results)}")
+            report.append("="*80)
+            print("\n".join(report))
         else:
             print("\nNo users were created successfully.")
             
     except Exception as e:
-        logger.error(f"Error in main processing: {e}")
+        logger.error("Error in main processing: %s", e)
         return
 
 if __name__ == "__main__":